@@ -0,0 +1,65 @@
+"""add indexes for per-user list and child lookup queries
+
+Revision ID: a1c7e5f3d9b2
+Revises: 2e3231736bcc
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c7e5f3d9b2'
+down_revision: Union[str, None] = '2e3231736bcc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (인덱스명, 테이블, 컬럼, partial 조건)
+INDEXES = [
+    # user_id = ? AND is_active = true ORDER BY created_at DESC LIMIT n
+    ('ix_resumes_user_id_created_at_active', 'resumes', ['user_id', sa.text('created_at DESC')], 'is_active = true'),
+    ('ix_jobpostings_user_id_created_at_active', 'jobpostings', ['user_id', sa.text('created_at DESC')], 'is_active = true'),
+    ('ix_resumefeedbacks_user_id_created_at', 'resumefeedbacks', ['user_id', sa.text('created_at DESC')], None),
+    ('ix_useractiviylogs_user_id_created_at', 'useractiviylogs', ['user_id', sa.text('created_at DESC')], None),
+    # 이력서 하위 테이블 (resume_id로 조회/삭제)
+    ('ix_experiences_resume_id', 'experiences', ['resume_id'], None),
+    ('ix_educations_resume_id', 'educations', ['resume_id'], None),
+    ('ix_projects_resume_id', 'projects', ['resume_id'], None),
+    ('ix_activities_resume_id', 'activities', ['resume_id'], None),
+    ('ix_technologystacks_resume_id', 'technologystacks', ['resume_id'], None),
+    ('ix_qualifications_resume_id', 'qualifications', ['resume_id'], None),
+    ('ix_resumefeedbacks_resume_id', 'resumefeedbacks', ['resume_id'], None),
+    ('ix_feedbackcontents_feedback_id', 'feedbackcontents', ['feedback_id'], None),
+    # 이력서 이미지 조회
+    ('ix_files_fileable_id_purpose', 'files', ['fileable_id', 'purpose'], None),
+]
+
+
+def upgrade() -> None:
+    # 운영 중 테이블 잠금을 피하기 위해 트랜잭션 밖에서 CONCURRENTLY로 생성
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
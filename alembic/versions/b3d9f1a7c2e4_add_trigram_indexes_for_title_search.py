@@ -0,0 +1,55 @@
+"""add pg_trgm GIN indexes for resume/jobposting title search
+
+Revision ID: b3d9f1a7c2e4
+Revises: a1c7e5f3d9b2
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9f1a7c2e4'
+down_revision: Union[str, None] = 'a1c7e5f3d9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (인덱스명, 테이블, 컬럼)
+INDEXES = [
+    ('ix_resumes_title_trgm', 'resumes', 'title'),
+    ('ix_jobpostings_title_trgm', 'jobpostings', 'title'),
+    ('ix_jobpostings_company_trgm', 'jobpostings', 'company'),
+]
+
+
+def upgrade() -> None:
+    # 한글 trigram 추출은 DB의 LC_CTYPE이 UTF-8 로케일(postgres 이미지 기본값 en_US.utf8)이어야 동작
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,33 @@
+"""add content hash to files and reference-counted storageobjects
+
+Revision ID: c5e2a8d4f1b6
+Revises: b3d9f1a7c2e4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a8d4f1b6'
+down_revision: Union[str, None] = 'b3d9f1a7c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('files', sa.Column('content_hash', sa.VARCHAR(length=64), nullable=True))
+    op.create_table('storageobjects',
+    sa.Column('file_key', sa.VARCHAR(length=100), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('file_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('storageobjects')
+    op.drop_column('files', 'content_hash')
@@ -0,0 +1,67 @@
+"""add userstats / userdailystats rollups for the dashboard
+
+Revision ID: d7a3c9e1b5f2
+Revises: c5e2a8d4f1b6
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3c9e1b5f2'
+down_revision: Union[str, None] = 'c5e2a8d4f1b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('userstats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_resumes', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('total_job_postings', sa.Integer(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('userdailystats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('resumes', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('feedbacks', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('job_postings', sa.Integer(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # 기존 데이터로 초기값 채우기 (활성 이력서/공고만 집계하던 기존 대시보드와 동일한 기준)
+    op.execute("""
+    INSERT INTO userstats (user_id, total_resumes, total_job_postings)
+    SELECT
+        u.user_id,
+        (SELECT COUNT(*) FROM resumes r WHERE r.user_id = u.user_id AND r.is_active = true),
+        (SELECT COUNT(*) FROM jobpostings j WHERE j.user_id = u.user_id AND j.is_active = true)
+    FROM users u
+    """)
+    op.execute("""
+    INSERT INTO userdailystats (user_id, day, resumes, feedbacks, job_postings)
+    SELECT user_id, day, SUM(resumes), SUM(feedbacks), SUM(job_postings)
+    FROM (
+        SELECT user_id, (created_at AT TIME ZONE 'UTC')::date AS day, 1 AS resumes, 0 AS feedbacks, 0 AS job_postings
+        FROM resumes WHERE is_active = true AND created_at IS NOT NULL
+        UNION ALL
+        SELECT user_id, (created_at AT TIME ZONE 'UTC')::date, 0, 1, 0
+        FROM resumefeedbacks WHERE created_at IS NOT NULL
+        UNION ALL
+        SELECT user_id, (created_at AT TIME ZONE 'UTC')::date, 0, 0, 1
+        FROM jobpostings WHERE is_active = true AND created_at IS NOT NULL
+    ) AS events
+    GROUP BY user_id, day
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('userdailystats')
+    op.drop_table('userstats')
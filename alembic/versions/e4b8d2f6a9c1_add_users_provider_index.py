@@ -0,0 +1,41 @@
+"""add (provider, provider_id) index on users for OAuth login lookups
+
+Revision ID: e4b8d2f6a9c1
+Revises: d7a3c9e1b5f2
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8d2f6a9c1'
+down_revision: Union[str, None] = 'd7a3c9e1b5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (provider, provider_id) = ? OR email = ? 조회는 이 인덱스와 email 유니크 인덱스의 BitmapOr 로 처리된다
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_provider_provider_id',
+            'users',
+            ['provider', 'provider_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_provider_provider_id',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,51 @@
+"""add sort_order to resume child tables so item order survives diff updates
+
+Revision ID: f2c6a8e4b7d3
+Revises: e4b8d2f6a9c1
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8e4b7d3'
+down_revision: Union[str, None] = 'e4b8d2f6a9c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 자식 테이블 -> primary key
+CHILD_TABLES = {
+    'experiences': 'experience_id',
+    'educations': 'education_id',
+    'projects': 'project_id',
+    'activities': 'activity_id',
+    'technologystacks': 'technology_stack_id',
+    'qualifications': 'qualification_id',
+}
+
+
+def upgrade() -> None:
+    for table, primary_key in CHILD_TABLES.items():
+        op.add_column(table, sa.Column('sort_order', sa.Integer(), nullable=False, server_default='0'))
+
+        # 기존 행은 지금까지 보이던 순서(id 순)로 채운다
+        op.execute(f"""
+            UPDATE {table} AS t
+            SET sort_order = ordered.sort_order
+            FROM (
+                SELECT {primary_key},
+                       ROW_NUMBER() OVER (PARTITION BY resume_id ORDER BY {primary_key}) - 1 AS sort_order
+                FROM {table}
+            ) AS ordered
+            WHERE t.{primary_key} = ordered.{primary_key}
+        """)
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        op.drop_column(table, 'sort_order')
@@ -12,7 +12,21 @@ class BaseConfig(BaseSettings):
     google_oauth_token_url : str = 'https://oauth2.googleapis.com/token'
     google_oauth_userinfo_url : str = "https://www.googleapis.com/oauth2/v2/userinfo"
     
+    
+    http_client_http2 : bool = True
+    http_client_max_connections : int = 100
+    http_client_max_keepalive : int = 20
+    http_client_keepalive_expiry : float = 30.0
+    http_client_timeout : float = 10.0
+    http_client_connect_timeout : float = 5.0
+    
     image_max_size : int = 5 * 1024 * 1024
+    image_chunk_size : int = 64 * 1024
+    image_normalized_max_size : int = 1024
+    image_thumbnail_size : int = 256
+    image_webp_quality : int = 80
+    image_process_workers : int = 2
+    image_max_pixels : int = 40_000_000
     
 
     image : str = "image"
@@ -20,10 +34,73 @@ class BaseConfig(BaseSettings):
     
     
     url_expire_minute : int = 300
+    presigned_url_reuse_ratio : float = 0.8
+    presigned_url_cache_max_size : int = 10000
+    
+    
+    storage_backend : str = "s3"  # s3 | local
+    storage_max_workers : int = 16
+    storage_max_attempts : int = 3
+    storage_connect_timeout : float = 5.0
+    storage_read_timeout : float = 30.0
+    storage_multipart_chunk_size : int = 5 * 1024 * 1024
+    local_storage_dir : str = "./storage"
+    local_storage_url : str = "/storage"
+    
     
+    redis_max_connections : int = 50
+    redis_socket_timeout : float = 5.0
     
+    
+    user_cache_ttl : int = 300
+    user_cache_local_ttl : int = 30
+    user_cache_max_size : int = 10000
+    
+    
+    llm_provider : str = "openai"
+    llm_base_url : str = ""
+    llm_api_key : str = ""
     ai_model: str = "gpt-4o-mini"
     temperature : float = 0.7
+    ai_timeout : int = 60
+    ai_max_retries : int = 2
+    ai_cache_ttl : int = 60 * 60 * 24 * 7
+    ai_cache_max_entries : int = 10000
+    
+    
+    llm_max_concurrency : int = 16
+    llm_process_concurrency : int = 8
+    llm_user_max_concurrency : int = 2
+    llm_interactive_reserved : int = 4
+    llm_rpm : int = 500
+    llm_tpm : int = 200000
+    llm_chars_per_token : int = 2
+    llm_output_tokens : int = 2000
+    llm_lease_margin : int = 10
+    llm_queue_deadline : float = 5.0
+    llm_background_queue_deadline : float = 300.0
+    llm_queue_poll_interval : float = 0.2
+    
+    
+    fake_llm_latency : float = 2.0
+    fake_llm_jitter : float = 0.5
+    fake_llm_seed : int = 0
+    
+    
+    dashboard_cache_ttl : int = 60
+    
+    
+    activity_flush_interval : float = 5.0
+    activity_buffer_max_size : int = 1000
+    
+    
+    feedback_job_ttl : int = 60 * 60 * 24
+    feedback_job_visibility_timeout : int = 60 * 10
+    feedback_job_max_attempts : int = 3
+    feedback_job_reap_interval : float = 30.0
+    feedback_worker_backoff : float = 1.0
+    feedback_worker_max_backoff : float = 30.0
+    feedback_worker_concurrency : int = 4
     
     
     
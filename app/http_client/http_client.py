@@ -0,0 +1,60 @@
+from typing import Optional
+import httpx
+from app.config.settings import settings
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client(
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """keep-alive/HTTP2 커넥션 풀을 쓰는 외부 호출용 클라이언트 생성
+
+    테스트에서는 transport 에 httpx.MockTransport 를 넘겨 실제 네트워크 없이 응답을 흉내낸다.
+    """
+
+    return httpx.AsyncClient(
+        http2=settings.http_client_http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_client_max_connections,
+            max_keepalive_connections=settings.http_client_max_keepalive,
+            keepalive_expiry=settings.http_client_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            settings.http_client_timeout, connect=settings.http_client_connect_timeout
+        ),
+        transport=transport,
+    )
+
+
+async def init_http_client(transport: Optional[httpx.AsyncBaseTransport] = None):
+    """앱 시작 시 공유 클라이언트 생성 (이미 있으면 교체)"""
+
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+
+    _http_client = create_http_client(transport=transport)
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """FastAPI 의존성으로 사용할 공유 HTTP 클라이언트"""
+
+    global _http_client
+
+    if _http_client is None:
+        _http_client = create_http_client()
+
+    return _http_client
+
+
+async def close_http_client():
+    """앱 종료 시 커넥션 풀 정리"""
+
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,165 @@
+import asyncio
+import random
+import time
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+from app.schema.schemas import ResumeCreate, ResumeFeedbackAI
+
+# 부하 테스트용 모델 - 외부 호출 없이 지연만 흉내내고 항상 같은 구조의 유효한 결과를 돌려준다
+
+PARENT_CONTENT_MAX_LENGTH = 2000
+
+
+def build_feedback(prompt_text: str) -> ResumeFeedbackAI:
+    """입력 프롬프트로 ResumeFeedbackAI 결과를 만드는 함수 - 같은 입력이면 같은 결과"""
+
+    return ResumeFeedbackAI(
+        parent_content=f"# 이력서 요약\n\n{prompt_text[:PARENT_CONTENT_MAX_LENGTH]}",
+        matching_rate=0,
+        feedback_contents=[
+            {"feedback_devision": "1", "feedback_result": "경력과 프로젝트가 구체적으로 정리되어 있습니다."},
+            {"feedback_devision": "2", "feedback_result": "프로젝트별 본인의 역할과 성과를 수치로 적어주세요."},
+            {"feedback_devision": "3", "feedback_result": "기술스택을 실제 사용 경험과 연결해 설명하면 좋습니다."},
+            {"feedback_devision": "4", "feedback_result": "자기소개에 지원 동기를 한 문단 추가하는 것을 권장합니다."},
+        ],
+    )
+
+
+def build_resume(prompt_text: str) -> ResumeCreate:
+    """입력 프롬프트와 무관하게 항상 유효한 ResumeCreate 결과를 만드는 함수"""
+
+    return ResumeCreate(
+        resume_type="3",
+        title="부하 테스트 이력서",
+        name="홍길동",
+        email="fake@example.com",
+        gender="1",
+        address="서울특별시",
+        phone="010-0000-0000",
+        military_service="2",
+        birth_date=date(1995, 1, 1),
+        self_introduction="피드백을 반영해 다시 작성한 자기소개입니다.",
+        technology_stacks=[{"title": "Python"}, {"title": "FastAPI"}],
+        experiences=[
+            {
+                "job_title": "백엔드 개발",
+                "department": "개발팀",
+                "employment_status": False,
+                "start_date": date(2020, 1, 1),
+                "end_date": date(2023, 12, 31),
+            }
+        ],
+        educations=[
+            {
+                "organ": "한국대학교",
+                "department": "컴퓨터공학과",
+                "degree_level": "3",
+                "start_date": date(2014, 3, 1),
+                "end_date": date(2020, 2, 28),
+            }
+        ],
+        projects=[
+            {
+                "title": "이력서 첨삭 서비스",
+                "start_date": date(2023, 1, 1),
+                "description": "FastAPI 기반 API 서버 개발",
+            }
+        ],
+    )
+
+
+# with_structured_output 에 넘어오는 스키마 이름 -> 결과 생성 함수
+FAKE_BUILDERS: Dict[str, Callable[[str], BaseModel]] = {
+    "ResumeFeedbackAI": build_feedback,
+    "ResumeCreate": build_resume,
+}
+
+
+def _schema_name(schema: Union[type, dict]) -> str:
+    if isinstance(schema, dict):
+        return schema.get("title", "")
+
+    return schema.__name__
+
+
+def _prompt_text(prompt: Any) -> str:
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+
+    return str(prompt)
+
+
+class FakeStructuredOutput(Runnable):
+    """with_structured_output 결과를 흉내내는 Runnable
+
+    스키마가 pydantic 모델이면 모델 객체를, JSON 스키마(dict)면 dict 를 반환한다.
+    JSON 스키마의 astream 은 리스트 필드를 한 항목씩 늘려가며 부분 결과를 내보낸다.
+    """
+
+    def __init__(self, llm: "FakeChatModel", schema: Union[type, dict]):
+        name = _schema_name(schema)
+
+        if name not in FAKE_BUILDERS:
+            raise ValueError(f"fake 모델이 지원하지 않는 스키마입니다: {name}")
+
+        self.llm = llm
+        self.schema = schema
+        self.builder = FAKE_BUILDERS[name]
+
+    def _build(self, prompt: Any) -> Union[BaseModel, dict]:
+        result = self.builder(_prompt_text(prompt))
+
+        if isinstance(self.schema, dict):
+            return result.model_dump(mode="json")
+
+        return result
+
+    def invoke(self, input: Any, config: Optional[dict] = None, **kwargs) -> Any:
+        time.sleep(self.llm.next_delay())
+        return self._build(input)
+
+    async def ainvoke(self, input: Any, config: Optional[dict] = None, **kwargs) -> Any:
+        await asyncio.sleep(self.llm.next_delay())
+        return self._build(input)
+
+    async def astream(
+        self, input: Any, config: Optional[dict] = None, **kwargs
+    ) -> AsyncIterator[Any]:
+        if not isinstance(self.schema, dict):
+            yield await self.ainvoke(input, config, **kwargs)
+            return
+
+        data = self.builder(_prompt_text(input)).model_dump(mode="json")
+        lists = {key: value for key, value in data.items() if isinstance(value, list)}
+
+        steps = max(sum(len(value) for value in lists.values()), 1)
+        delay = self.llm.next_delay() / steps
+
+        partial = {key: value for key, value in data.items() if key not in lists}
+
+        for key, items in lists.items():
+            partial[key] = []
+
+            for item in items:
+                await asyncio.sleep(delay)
+                partial[key].append(item)
+                yield {**partial, key: list(partial[key])}
+
+        yield data
+
+
+class FakeChatModel:
+    """latency ± jitter 초 뒤에 고정된 결과를 돌려주는 가짜 채팅 모델"""
+
+    def __init__(self, latency: float, jitter: float, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+    def next_delay(self) -> float:
+        return max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0.0)
+
+    def with_structured_output(self, schema: Union[type, dict], **kwargs) -> FakeStructuredOutput:
+        return FakeStructuredOutput(self, schema)
@@ -0,0 +1,86 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+from langchain_openai import ChatOpenAI
+from app.config.settings import settings
+from app.llm_client.fake_llm import FakeChatModel
+
+logger = logging.getLogger(__name__)
+
+
+_llm: Optional[Any] = None
+
+
+def create_openai_llm() -> ChatOpenAI:
+    """OpenAI API 모델"""
+
+    return ChatOpenAI(
+        api_key=settings.openai_api_key,
+        model=settings.ai_model,
+        temperature=settings.temperature,
+        timeout=settings.ai_timeout,
+        max_retries=settings.ai_max_retries,
+    )
+
+
+def create_local_llm() -> ChatOpenAI:
+    """OpenAI 호환 API 를 제공하는 로컬 서버(vLLM, Ollama 등) 모델"""
+
+    return ChatOpenAI(
+        base_url=settings.llm_base_url,
+        # 로컬 서버는 키를 검사하지 않는 경우가 많지만 클라이언트는 값이 필요하다
+        api_key=settings.llm_api_key or "EMPTY",
+        model=settings.ai_model,
+        temperature=settings.temperature,
+        timeout=settings.ai_timeout,
+        max_retries=settings.ai_max_retries,
+    )
+
+
+def create_fake_llm() -> FakeChatModel:
+    """외부 호출 없이 지연만 흉내내는 부하 테스트용 모델"""
+
+    return FakeChatModel(
+        latency=settings.fake_llm_latency,
+        jitter=settings.fake_llm_jitter,
+        seed=settings.fake_llm_seed,
+    )
+
+
+# settings.llm_provider 값 -> 모델 생성 함수
+LLM_PROVIDERS: Dict[str, Callable[[], Any]] = {
+    "openai": create_openai_llm,
+    "local": create_local_llm,
+    "fake": create_fake_llm,
+}
+
+
+def create_llm(provider: Optional[str] = None) -> Any:
+    """provider 에 맞는 채팅 모델 생성 - with_structured_output 을 지원하는 객체를 반환"""
+
+    provider = provider or settings.llm_provider
+
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"지원하지 않는 LLM provider 입니다: {provider}")
+
+    logger.info(f"LLM provider: {provider}")
+
+    return LLM_PROVIDERS[provider]()
+
+
+def get_llm() -> Any:
+    """공유 채팅 모델 - 처음 사용할 때 생성하므로 import 시점에는 LLM 설정이 필요 없다"""
+
+    global _llm
+
+    if _llm is None:
+        _llm = create_llm()
+
+    return _llm
+
+
+def set_llm(llm: Optional[Any]):
+    """공유 채팅 모델 교체 (None 이면 다음 사용 시 settings 로 다시 생성)"""
+
+    global _llm
+
+    _llm = llm
@@ -4,12 +4,14 @@ from sqlalchemy import (
     Column,
     Date,
     ForeignKey,
+    Index,
     Integer,
     Text,
     TIMESTAMP,
 )
 from app.database import Base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
 from datetime import datetime, timezone
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -17,6 +19,9 @@ from sqlalchemy.ext.hybrid import hybrid_property
 class User(Base):
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_provider_provider_id", "provider", "provider_id"),
+    )
 
     user_id = Column(Integer, primary_key=True)
     unique_id = Column(VARCHAR(22), unique=True, nullable=False)
@@ -128,6 +133,9 @@ class UserBlacklist(Base):
 class UserActivityLog(Base):
 
     __tablename__ = "useractiviylogs"
+    __table_args__ = (
+        Index("ix_useractiviylogs_user_id_created_at", "user_id", text("created_at DESC")),
+    )
 
     log_id = Column(Integer, primary_key=True)
     user_id = Column(
@@ -146,9 +154,55 @@ class UserActivityLog(Base):
     user = relationship("User", back_populates="activity_logs")
 
 
+class UserStat(Base):
+    """대시보드용 사용자별 누적 카운터 - 이력서/공고 쓰기 시 증감"""
+
+    __tablename__ = "userstats"
+
+    user_id = Column(
+        Integer, ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True
+    )
+    total_resumes = Column(Integer, nullable=False, default=0)
+    total_job_postings = Column(Integer, nullable=False, default=0)
+
+
+class UserDailyStat(Base):
+    """대시보드용 사용자별 일(UTC) 단위 생성 건수 - 최근 7일 통계는 이 버킷을 합산"""
+
+    __tablename__ = "userdailystats"
+
+    user_id = Column(
+        Integer, ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    resumes = Column(Integer, nullable=False, default=0)
+    feedbacks = Column(Integer, nullable=False, default=0)
+    job_postings = Column(Integer, nullable=False, default=0)
+
+
 class JobPosting(Base):
 
     __tablename__ = "jobpostings"
+    __table_args__ = (
+        Index(
+            "ix_jobpostings_user_id_created_at_active",
+            "user_id",
+            text("created_at DESC"),
+            postgresql_where=text("is_active = true"),
+        ),
+        Index(
+            "ix_jobpostings_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_jobpostings_company_trgm",
+            "company",
+            postgresql_using="gin",
+            postgresql_ops={"company": "gin_trgm_ops"},
+        ),
+    )
 
     posting_id = Column(Integer, primary_key=True)
     user_id = Column(
@@ -181,6 +235,20 @@ class JobPosting(Base):
 class Resume(Base):
 
     __tablename__ = "resumes"
+    __table_args__ = (
+        Index(
+            "ix_resumes_user_id_created_at_active",
+            "user_id",
+            text("created_at DESC"),
+            postgresql_where=text("is_active = true"),
+        ),
+        Index(
+            "ix_resumes_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     resume_id = Column(Integer, primary_key=True)
     user_id = Column(
@@ -212,27 +280,45 @@ class Resume(Base):
     job_posting = relationship("JobPosting", back_populates="resumes")
 
     projects = relationship(
-        "Project", back_populates="resume", cascade="all, delete-orphan"
+        "Project",
+        back_populates="resume",
+        cascade="all, delete-orphan",
+        order_by="[Project.sort_order, Project.project_id]",
     )
 
     activities = relationship(
-        "Activity", back_populates="resume", cascade="all, delete-orphan"
+        "Activity",
+        back_populates="resume",
+        cascade="all, delete-orphan",
+        order_by="[Activity.sort_order, Activity.activity_id]",
     )
 
     experiences = relationship(
-        "Experience", back_populates="resume", cascade="all, delete-orphan"
+        "Experience",
+        back_populates="resume",
+        cascade="all, delete-orphan",
+        order_by="[Experience.sort_order, Experience.experience_id]",
     )
 
     technology_stacks = relationship(
-        "TechnologyStack", back_populates="resume", cascade="all, delete-orphan"
+        "TechnologyStack",
+        back_populates="resume",
+        cascade="all, delete-orphan",
+        order_by="[TechnologyStack.sort_order, TechnologyStack.technology_stack_id]",
     )
 
     educations = relationship(
-        "Education", back_populates="resume", cascade="all, delete-orphan"
+        "Education",
+        back_populates="resume",
+        cascade="all, delete-orphan",
+        order_by="[Education.sort_order, Education.education_id]",
     )
 
     qualifications = relationship(
-        "Qualification", back_populates="resume", cascade="all, delete-orphan"
+        "Qualification",
+        back_populates="resume",
+        cascade="all, delete-orphan",
+        order_by="[Qualification.sort_order, Qualification.qualification_id]",
     )
 
     files = relationship("File", back_populates="resume")
@@ -252,12 +338,17 @@ class Project(Base):
 
     project_id = Column(Integer, primary_key=True)
     resume_id = Column(
-        Integer, ForeignKey("resumes.resume_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("resumes.resume_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     title = Column(VARCHAR(100), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
     description = Column(VARCHAR(500))
+    # 이력서 안에서의 표시 순서 (요청 목록의 인덱스)
+    sort_order = Column(Integer, nullable=False, server_default="0")
 
     resume = relationship("Resume", back_populates="projects")
 
@@ -268,12 +359,17 @@ class Activity(Base):
 
     activity_id = Column(Integer, primary_key=True)
     resume_id = Column(
-        Integer, ForeignKey("resumes.resume_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("resumes.resume_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     title = Column(VARCHAR(100), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
     description = Column(VARCHAR(500))
+    # 이력서 안에서의 표시 순서 (요청 목록의 인덱스)
+    sort_order = Column(Integer, nullable=False, server_default="0")
 
     resume = relationship("Resume", back_populates="activities")
 
@@ -284,7 +380,10 @@ class Experience(Base):
 
     experience_id = Column(Integer, primary_key=True)
     resume_id = Column(
-        Integer, ForeignKey("resumes.resume_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("resumes.resume_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     job_title = Column(VARCHAR(100), nullable=False)
     department = Column(VARCHAR(100), nullable=False)
@@ -293,6 +392,8 @@ class Experience(Base):
     employment_status = Column(Boolean, nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
+    # 이력서 안에서의 표시 순서 (요청 목록의 인덱스)
+    sort_order = Column(Integer, nullable=False, server_default="0")
 
     resume = relationship("Resume", back_populates="experiences")
 
@@ -303,9 +404,14 @@ class TechnologyStack(Base):
 
     technology_stack_id = Column(Integer, primary_key=True)
     resume_id = Column(
-        Integer, ForeignKey("resumes.resume_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("resumes.resume_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     title = Column(VARCHAR(100), nullable=False)
+    # 이력서 안에서의 표시 순서 (요청 목록의 인덱스)
+    sort_order = Column(Integer, nullable=False, server_default="0")
 
     resume = relationship("Resume", back_populates="technology_stacks")
 
@@ -316,7 +422,10 @@ class Education(Base):
 
     education_id = Column(Integer, primary_key=True)
     resume_id = Column(
-        Integer, ForeignKey("resumes.resume_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("resumes.resume_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     organ = Column(VARCHAR(100), nullable=False)
     department = Column(VARCHAR(100), nullable=False)
@@ -324,6 +433,8 @@ class Education(Base):
     score = Column(VARCHAR(50))
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
+    # 이력서 안에서의 표시 순서 (요청 목록의 인덱스)
+    sort_order = Column(Integer, nullable=False, server_default="0")
 
     resume = relationship("Resume", back_populates="educations")
 
@@ -335,12 +446,17 @@ class Qualification(Base):
 
     qualification_id = Column(Integer, primary_key=True)
     resume_id = Column(
-        Integer, ForeignKey("resumes.resume_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("resumes.resume_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     title = Column(VARCHAR(100), nullable=False)
     acquisition_date = Column(Date, nullable=False)
     score = Column(VARCHAR(50))
     organ = Column(VARCHAR(100))
+    # 이력서 안에서의 표시 순서 (요청 목록의 인덱스)
+    sort_order = Column(Integer, nullable=False, server_default="0")
 
     resume = relationship("Resume", back_populates="qualifications")
 
@@ -348,6 +464,9 @@ class Qualification(Base):
 class File(Base):
 
     __tablename__ = "files"
+    __table_args__ = (
+        Index("ix_files_fileable_id_purpose", "fileable_id", "purpose"),
+    )
 
     file_id = Column(Integer, primary_key=True)
     fileable_id = Column(Integer, ForeignKey("resumes.resume_id", ondelete="SET NULL"))
@@ -359,6 +478,7 @@ class File(Base):
     org_file_name = Column(VARCHAR(100), nullable=False)
     mod_file_name = Column(VARCHAR(100), nullable=False)
     file_key = Column(VARCHAR(100), nullable=False)
+    content_hash = Column(VARCHAR(64))
     purpose = Column(VARCHAR(50), nullable=False)
     created_at = Column(
         TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
@@ -368,13 +488,31 @@ class File(Base):
     resume = relationship("Resume", back_populates="files")
 
 
+class StorageObject(Base):
+    """content-addressed 스토리지 객체의 참조 카운트 - 여러 files 행이 같은 객체를 공유한다"""
+
+    __tablename__ = "storageobjects"
+
+    file_key = Column(VARCHAR(100), primary_key=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(
+        TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
 class ResumeFeedback(Base):
 
     __tablename__ = "resumefeedbacks"
+    __table_args__ = (
+        Index("ix_resumefeedbacks_user_id_created_at", "user_id", text("created_at DESC")),
+    )
 
     feedback_id = Column(Integer, primary_key=True)
     resume_id = Column(
-        Integer, ForeignKey("resumes.resume_id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("resumes.resume_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     user_id = Column(
         Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
@@ -410,6 +548,7 @@ class FeedbackContent(Base):
         Integer,
         ForeignKey("resumefeedbacks.feedback_id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     feedback_devision = Column(VARCHAR(10), nullable=False)
     feedback_result = Column(Text, nullable=False)
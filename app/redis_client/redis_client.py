@@ -0,0 +1,28 @@
+import redis.asyncio as redis
+from app.config.settings import settings
+
+
+redis_pool = redis.ConnectionPool(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    max_connections=settings.redis_max_connections,
+    socket_timeout=settings.redis_socket_timeout,
+    socket_connect_timeout=settings.redis_socket_timeout,
+    health_check_interval=30,
+    decode_responses=True,
+)
+
+redis_client = redis.Redis(connection_pool=redis_pool)
+
+
+async def get_redis() -> redis.Redis:
+    """FastAPI 의존성으로 사용할 Redis 클라이언트"""
+
+    return redis_client
+
+
+async def close_redis():
+    """앱 종료 시 커넥션 풀 정리"""
+
+    await redis_client.aclose()
+    await redis_pool.aclose()
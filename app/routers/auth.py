@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime
 import traceback
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -8,13 +8,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import settings
 from app.database import get_db
+from app.http_client.http_client import get_http_client
 from app.models.models import User
-from app.service.login_service import (
-    create_user,
-    get_user_by_email,
-    get_user_by_provider,
+from app.service.activity_service import ACTION_SIGNUP, record_activity
+from app.service.login_service import create_user
+from app.service.oauth_service import exchange_google_code, oauth_login
+from app.security import (
+    create_access_token,
+    oauth2_scheme,
+    revoke_token,
+    verify_token,
 )
-from app.security import create_access_token
+from app.service.user_cache_service import invalidate_user
 from app.schema.schemas import AuthCode, UserActivate, UserCreate
 
 logger = logging.getLogger(__name__)
@@ -23,85 +28,18 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/google/localhost")
-async def auth_google_localhost(code: AuthCode, db: AsyncSession = Depends(get_db)):
+async def auth_google_localhost(
+    code: AuthCode,
+    db: AsyncSession = Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     """구글 간편 로그인 엔드포인트"""
     try:
-        async with httpx.AsyncClient() as client:
-            token_data_payload = {
-                "code": code.code,
-                "client_id": settings.google_client_id,
-                "client_secret": settings.google_client_secret,
-                "redirect_uri": "http://localhost:5173/frontend/googleCallback",
-                "grant_type": "authorization_code",
-            }
-
-            token_response = await client.post(
-                settings.google_oauth_token_url,
-                data=token_data_payload,
-            )
-
-            if token_response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"토큰 교환 실패: {token_response.text}",
-                )
-
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
-
-            # 4. 사용자 정보 요청
-            user_info_response = await client.get(
-                settings.google_oauth_userinfo_url,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-
-            if user_info_response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"사용자 정보 불러오기 실패: {user_info_response.text}",
-                )
-
-            user_info = user_info_response.json()
-
-        # 5. DB 조회
-        user = await get_user_by_provider(db, "google", user_info["id"])
-
-        if not user:
-            user = await get_user_by_email(db, user_info["email"])
-
-            if not user:
-                return {
-                    "is_new_user": True,
-                    "user": {
-                        "provider": "google",
-                        "provider_id": user_info["id"],
-                        "email": user_info["email"],
-                        "name": user_info["name"],
-                    },
-                }
-                
-        if user.is_active == False:
-            return {
-                "is_new_user": False,
-                "user": {
-                    "user_id": user.user_id
-                },
-                "is_active": False,
-            }
-
-        # 6. JWT 생성
-        jwt_token = create_access_token(data={"sub": user.unique_id})
+        user_info = await exchange_google_code(
+            client, code=code.code, redirect_uri="http://localhost:5173/frontend/googleCallback"
+        )
 
-        user.last_accessed = datetime.now(timezone.utc)
-        await db.commit()
-        await db.refresh(user)
-
-        return {
-            "access_token": jwt_token,
-            "token_type": "bearer",
-            "user": {"name": user.name, "email": user.email},
-            "is_new_user": False,
-        }
+        return await oauth_login(db, provider="google", user_info=user_info)
 
     except Exception as e:
         await db.rollback()
@@ -114,87 +52,18 @@ async def auth_google_localhost(code: AuthCode, db: AsyncSession = Depends(get_d
 
 
 @router.post("/google")
-async def auth_google(code: AuthCode, db: AsyncSession = Depends(get_db)):
+async def auth_google(
+    code: AuthCode,
+    db: AsyncSession = Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     """구글 간편 로그인 엔드포인트"""
     try:
-        async with httpx.AsyncClient() as client:
-            token_data_payload = {
-                "code": code.code,
-                "client_id": settings.google_client_id,
-                "client_secret": settings.google_client_secret,
-                "redirect_uri": f"{settings.front_end_domain}/frontend/googleCallback",
-                "grant_type": "authorization_code",
-            }
-
-            token_response = await client.post(
-                settings.google_oauth_token_url,
-                data=token_data_payload,
-            )
-
-            if token_response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"토큰 교환 실패: {token_response.text}",
-                )
-
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
-
-            # 4. 사용자 정보 요청
-            user_info_response = await client.get(
-                settings.google_oauth_userinfo_url,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-
-            if user_info_response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"사용자 정보 불러오기 실패: {user_info_response.text}",
-                )
-
-            user_info = user_info_response.json()
-
-        # 5. DB 조회
-        user = await get_user_by_provider(db, "google", user_info["id"])
-
-        if not user:
-            user = await get_user_by_email(db, user_info["email"])
-
-            if not user:
-                return {
-                    "is_new_user": True,
-                    "user": {
-                        "provider": "google",
-                        "provider_id": user_info["id"],
-                        "email": user_info["email"],
-                        "name": user_info["name"],
-                    },
-                    "is_active": True,
-                }
-
-        if user.is_active == False:
-            return {
-                "is_new_user": False,
-                "user": {
-                    "user_id": user.user_id
-                },
-                "is_active": False,
-            }
-
-        # 6. JWT 생성
-        jwt_token = create_access_token(data={"sub": user.unique_id})
+        user_info = await exchange_google_code(
+            client, code=code.code, redirect_uri=f"{settings.front_end_domain}/frontend/googleCallback"
+        )
 
-        user.last_accessed = datetime.now(timezone.utc)
-        await db.commit()
-        await db.refresh(user)
-
-        return {
-            "access_token": jwt_token,
-            "token_type": "bearer",
-            "user": {"name": user.name, "email": user.email},
-            "is_new_user": False,
-            "is_active": True,
-        }
+        return await oauth_login(db, provider="google", user_info=user_info)
 
     except Exception as e:
         await db.rollback()
@@ -231,6 +100,8 @@ async def signup(data: UserCreate, db: AsyncSession = Depends(get_db)):
 
         await db.commit()
 
+        record_activity(user.user_id, ACTION_SIGNUP)
+
         return {
             "access_token": jwt_token,
             "token_type": "bearer",
@@ -267,6 +138,8 @@ async def activate_user(data: UserActivate, db: AsyncSession = Depends(get_db)):
 
         await db.commit()
 
+        await invalidate_user(user.unique_id)
+
         return {
             "access_token": jwt_token,
             "token_type": "bearer",
@@ -280,4 +153,20 @@ async def activate_user(data: UserActivate, db: AsyncSession = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"에러 상세: {str(e)}",
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(oauth2_scheme)):
+    """로그아웃 엔드포인트 - 현재 토큰을 블랙리스트에 등록"""
+
+    payload = verify_token(token)
+
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="유효하지 않은 토큰 입니다."
+        )
+
+    await revoke_token(payload)
+
+    return
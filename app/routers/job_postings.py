@@ -1,5 +1,5 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Response, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
@@ -7,6 +7,8 @@ from app.database import get_db
 from app.models.models import User, JobPosting as DBJobPosting
 from app.schema.schemas import JobPostingResponse, JobPostingCreate, JobPostingUpdate
 from app.security import get_current_user
+from app.service.dashboard_service import invalidate_dashboard, record_stat
+from app.service.pagination_service import NEXT_CURSOR_HEADER
 
 import app.service.posting_service as crud  # app/job_postings.py 파일 (CRUD 로직)
 
@@ -37,16 +39,24 @@ async def create_job_posting_endpoint(
 
 @router.get("/", response_model=List[JobPostingResponse])
 async def read_all_job_postings_endpoint(
+    response: Response,
     title: Optional[str] = None,
     page: int = 1,
     page_size: int = 6,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """모든 채용 공고 목록을 조회합니다."""
+    """모든 채용 공고 목록을 조회합니다. cursor를 주면(첫 페이지는 빈 문자열) 다음 커서를 X-Next-Cursor 헤더로 반환합니다."""
     try:
-        job_postings = await crud.get_job_postings(db=db,user_id=current_user.user_id, page = page, page_size = page_size, title = title)
+        job_postings, next_cursor = await crud.get_job_postings(db=db,user_id=current_user.user_id, page = page, page_size = page_size, title = title, cursor = cursor)
+
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
         return job_postings
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -158,10 +168,20 @@ async def delete_job_posting_endpoint(
                 detail="잘못된 접근입니다."
             )
 
+        if job_posting.is_active:
+            await record_stat(
+                db=db,
+                user_id=current_user.user_id,
+                metric="job_postings",
+                delta=-1,
+                at=job_posting.created_at,
+            )
+
         # 소프트 삭제: is_active을 False로 설정
         job_posting.is_active = False
 
         await db.commit()
+        await invalidate_dashboard(current_user.user_id)
 
         return
 
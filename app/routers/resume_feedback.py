@@ -1,9 +1,12 @@
-from typing import List
+from typing import AsyncIterator, List, Optional, Union
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import and_, func, select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.models.models import (
     Activity,
     Education,
@@ -18,7 +21,10 @@ from app.models.models import (
     User,
 )
 from app.schema.schemas import (
+    FeedbackContentAI,
+    FeedbackJobResponse,
     JobPostingCreate,
+    LLMCacheStatsResponse,
     JobPostingResponse,
     ResumeCreate,
     ResumeFeedbackAI,
@@ -27,6 +33,14 @@ from app.schema.schemas import (
     ResumeResponse,
 )
 from app.security import get_current_user
+from app.service.dashboard_service import invalidate_dashboard, record_stat
+from app.service.feedback_job_service import enqueue_feedback_job, get_feedback_job
+from app.service.llm_cache_service import get_cache_stats
+from app.service.pagination_service import (
+    NEXT_CURSOR_HEADER,
+    keyset_condition,
+    split_page,
+)
 from app.service.resume_feedback_service import (
     create_posting_resume_by_feedback,
     create_resume_by_feedback,
@@ -34,6 +48,8 @@ from app.service.resume_feedback_service import (
     get_resume_feedback,
     resume_feedback_with_posting,
     resume_standard_feedback,
+    save_resume_feedback,
+    stream_resume_feedback,
 )
 from app.service.resume_service import get_resume_response
 
@@ -45,6 +61,7 @@ router = APIRouter(prefix="/resume_feedbacks", tags=["Resume_Feedback"])
 @router.post("/stantard/{resume_id}", response_model=ResumeFeedbackResponse)
 async def resume_feedback(
     resume_id: int,
+    refresh: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -67,34 +84,23 @@ async def resume_feedback(
         resume_response = ResumeResponse.model_validate(resume)
         resume_dict = resume_response.model_dump()
 
-        result = await resume_standard_feedback(resume_dict)
+        result = await resume_standard_feedback(
+            resume_dict, refresh=refresh, user_id=current_user.user_id
+        )
 
-        new_feedback = ResumeFeedback(
-            resume_id=resume.get("resume_id"),
+        feedback = await save_resume_feedback(
+            result=result,
+            db=db,
             user_id=current_user.user_id,
-            parent_content=result.parent_content,
-            matching_rate=result.matching_rate,
-        )
-        db.add(new_feedback)
-        await db.flush()
-        await db.refresh(new_feedback)
-
-        for content in result.feedback_contents:
-            new_feedback_content = FeedbackContent(
-                feedback_id=new_feedback.feedback_id,
-                feedback_devision=content.feedback_devision,
-                feedback_result=content.feedback_result,
-            )
-            db.add(new_feedback_content)
-
-        await db.commit()
-
-        feedback = await get_resume_feedback(
-            db=db, feedback_id=new_feedback.feedback_id
+            resume_id=resume.get("resume_id"),
         )
 
         return feedback
 
+    except HTTPException:
+        await db.rollback()
+        raise
+
     except Exception as e:
         await db.rollback()
         logger.error(f"error: {e}")
@@ -108,6 +114,7 @@ async def resume_feedback(
 async def resume_feedback_with_jobposting(
     resume_id: int,
     posting_id: int,
+    refresh: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -143,35 +150,27 @@ async def resume_feedback_with_jobposting(
 
         posting = JobPostingResponse.from_orm(posting).model_dump()
 
-        result = await resume_feedback_with_posting(resume=resume_dict, posting=posting)
+        result = await resume_feedback_with_posting(
+            resume=resume_dict,
+            posting=posting,
+            refresh=refresh,
+            user_id=current_user.user_id,
+        )
 
-        new_feedback = ResumeFeedback(
+        feedback = await save_resume_feedback(
+            result=result,
+            db=db,
+            user_id=current_user.user_id,
             resume_id=resume.get("resume_id"),
             posting_id=posting_id,
-            user_id=current_user.user_id,
-            parent_content=result.parent_content,
-            matching_rate=result.matching_rate,
-        )
-        db.add(new_feedback)
-        await db.flush()
-        await db.refresh(new_feedback)
-
-        for content in result.feedback_contents:
-            new_feedback_content = FeedbackContent(
-                feedback_id=new_feedback.feedback_id,
-                feedback_devision=content.feedback_devision,
-                feedback_result=content.feedback_result,
-            )
-            db.add(new_feedback_content)
-
-        await db.commit()
-
-        feedback = await get_resume_feedback(
-            db=db, feedback_id=new_feedback.feedback_id
         )
 
         return feedback
 
+    except HTTPException:
+        await db.rollback()
+        raise
+
     except Exception as e:
         await db.rollback()
         logger.error(f"error: {e}")
@@ -181,9 +180,272 @@ async def resume_feedback_with_jobposting(
         )
 
 
+def sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 포맷"""
+
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def feedback_event_stream(
+    items: AsyncIterator[Union[FeedbackContentAI, ResumeFeedbackAI]],
+    user_id: int,
+    resume_id: int,
+    posting_id: Optional[int] = None,
+):
+    """피드백 항목을 생성되는 대로 전송하고, 완료 후 저장된 피드백을 전송하는 제너레이터"""
+
+    try:
+        result = None
+
+        async for item in items:
+            if isinstance(item, ResumeFeedbackAI):
+                result = item
+            else:
+                yield sse_event("content", item.model_dump())
+
+        # 요청 세션은 응답 시작 전에 닫히므로 저장용 세션을 새로 연다
+        async with AsyncSessionLocal() as db:
+            feedback = await save_resume_feedback(
+                result=result,
+                db=db,
+                user_id=user_id,
+                resume_id=resume_id,
+                posting_id=posting_id,
+            )
+
+        yield sse_event("done", feedback.model_dump(mode="json"))
+
+    except asyncio.TimeoutError:
+        logger.error(f"stream timeout: resume {resume_id}")
+        yield sse_event("error", {"detail": "AI 응답 시간이 초과되었습니다."})
+
+    except Exception as e:
+        logger.error(f"error: {e}")
+        yield sse_event("error", {"detail": "피드백 생성에 실패했습니다."})
+
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.post("/stream/standard/{resume_id}")
+async def stream_resume_feedback_endpoint(
+    resume_id: int,
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """일반 이력서 첨삭 스트리밍(SSE) 엔드포인트"""
+
+    resume = await get_resume_response(resume_id=resume_id, db=db)
+
+    if resume is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 이력서 입니다.",
+        )
+
+    if resume.get("user_id") != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
+        )
+
+    resume_dict = ResumeResponse.model_validate(resume).model_dump()
+
+    # 한도 초과(429)는 스트림을 열기 전에 응답
+    items = await stream_resume_feedback(
+        resume=resume_dict, refresh=refresh, user_id=current_user.user_id
+    )
+
+    return StreamingResponse(
+        feedback_event_stream(
+            items=items,
+            user_id=current_user.user_id,
+            resume_id=resume_id,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.post("/stream/posting/{resume_id}/{posting_id}")
+async def stream_resume_feedback_with_posting_endpoint(
+    resume_id: int,
+    posting_id: int,
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """공고별 이력서 첨삭 스트리밍(SSE) 엔드포인트"""
+
+    resume = await get_resume_response(resume_id=resume_id, db=db)
+
+    if resume is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 이력서 입니다.",
+        )
+
+    if resume.get("user_id") != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
+        )
+
+    posting = await db.get(JobPosting, posting_id)
+
+    if posting is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 공고입니다.",
+        )
+
+    if posting.user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
+        )
+
+    resume_dict = ResumeResponse.model_validate(resume).model_dump()
+    posting = JobPostingResponse.from_orm(posting).model_dump()
+
+    # 한도 초과(429)는 스트림을 열기 전에 응답
+    items = await stream_resume_feedback(
+        resume=resume_dict,
+        posting=posting,
+        refresh=refresh,
+        user_id=current_user.user_id,
+    )
+
+    return StreamingResponse(
+        feedback_event_stream(
+            items=items,
+            user_id=current_user.user_id,
+            resume_id=resume_id,
+            posting_id=posting_id,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.post(
+    "/jobs/standard/{resume_id}",
+    response_model=FeedbackJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_resume_feedback_job(
+    resume_id: int,
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """일반 이력서 첨삭 작업 등록 엔드포인트 (작업 id 즉시 반환)"""
+
+    resume = await db.get(Resume, resume_id)
+
+    if resume is None or resume.is_active == False:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 이력서 입니다.",
+        )
+
+    if resume.user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
+        )
+
+    job_id = await enqueue_feedback_job(
+        user_id=current_user.user_id, resume_id=resume_id, refresh=refresh
+    )
+
+    return {"job_id": job_id, "status": "queued"}
+
+
+@router.post(
+    "/jobs/posting/{resume_id}/{posting_id}",
+    response_model=FeedbackJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_resume_feedback_with_posting_job(
+    resume_id: int,
+    posting_id: int,
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """공고별 이력서 첨삭 작업 등록 엔드포인트 (작업 id 즉시 반환)"""
+
+    resume = await db.get(Resume, resume_id)
+
+    if resume is None or resume.is_active == False:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 이력서 입니다.",
+        )
+
+    if resume.user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
+        )
+
+    posting = await db.get(JobPosting, posting_id)
+
+    if posting is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 공고입니다.",
+        )
+
+    if posting.user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
+        )
+
+    job_id = await enqueue_feedback_job(
+        user_id=current_user.user_id,
+        resume_id=resume_id,
+        posting_id=posting_id,
+        refresh=refresh,
+    )
+
+    return {"job_id": job_id, "status": "queued"}
+
+
+@router.get("/jobs/{job_id}", response_model=FeedbackJobResponse)
+async def get_resume_feedback_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """첨삭 작업 상태/결과 조회 엔드포인트"""
+
+    job = await get_feedback_job(job_id)
+
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 작업입니다.",
+        )
+
+    if job.get("user_id") != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
+        )
+
+    feedback = None
+    if job.get("status") == "done":
+        feedback = await get_resume_feedback(db=db, feedback_id=job.get("feedback_id"))
+
+    return {
+        "job_id": job_id,
+        "status": job.get("status"),
+        "feedback": feedback,
+        "error": job.get("error"),
+    }
+
+
 @router.post("/standard_resume/{feedback_id}", response_model=ResumeResponse)
 async def apply_feedback(
     feedback_id: int,
+    refresh: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -220,7 +482,12 @@ async def apply_feedback(
 
         feedback = feedback.model_dump()
 
-        result = await create_resume_by_feedback(resume=resume_dict, feedback=feedback)
+        result = await create_resume_by_feedback(
+            resume=resume_dict,
+            feedback=feedback,
+            refresh=refresh,
+            user_id=current_user.user_id,
+        )
 
         new_resume = await create_resume_with_feedback(
             result=result,
@@ -231,6 +498,10 @@ async def apply_feedback(
 
         return new_resume
 
+    except HTTPException:
+        await db.rollback()
+        raise
+
     except Exception as e:
         await db.rollback()
         logger.error(f"error: {e}")
@@ -243,6 +514,7 @@ async def apply_feedback(
 @router.post("/posting_resume/{feedback_id}", response_model=ResumeResponse)
 async def apply_feedback_with_posting(
     feedback_id: int,
+    refresh: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -293,7 +565,11 @@ async def apply_feedback_with_posting(
         resume_dict = resume_response.model_dump()
 
         result = await create_posting_resume_by_feedback(
-            resume=resume_dict, feedback=feedback, posting=posting
+            resume=resume_dict,
+            feedback=feedback,
+            posting=posting,
+            refresh=refresh,
+            user_id=current_user.user_id,
         )
 
         new_resume = await create_resume_with_feedback(
@@ -307,6 +583,10 @@ async def apply_feedback_with_posting(
 
         return new_resume
 
+    except HTTPException:
+        await db.rollback()
+        raise
+
     except Exception as e:
         await db.rollback()
         logger.error(f"error: {e}")
@@ -318,16 +598,32 @@ async def apply_feedback_with_posting(
 
 @router.get("/", response_model=List[ResumeFeedbackListResponse])
 async def get_resumefeedback_list(
+    response: Response,
     page: int = 1,
     page_size: int = 6,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """이력서 리스트를 가져오는 엔드포인트"""
+    """이력서 리스트를 가져오는 엔드포인트
+
+    cursor 파라미터가 있으면(첫 페이지는 빈 문자열) 커서 페이지네이션으로 조회하고,
+    다음 커서를 X-Next-Cursor 헤더로 반환한다.
+    """
 
     try:
 
-        offset = (page - 1) * page_size
+        conditions = [
+            ResumeFeedback.user_id == current_user.user_id,
+            Resume.is_active == True,
+        ]
+
+        if cursor:
+            conditions.append(
+                keyset_condition(
+                    ResumeFeedback.created_at, ResumeFeedback.feedback_id, cursor
+                )
+            )
 
         data_stmt = (
             select(
@@ -336,6 +632,7 @@ async def get_resumefeedback_list(
                 JobPosting.company,
                 Resume.title,
                 ResumeFeedback.feedback_id,
+                ResumeFeedback.created_at,
             )
             .outerjoin(
                 FeedbackContent,
@@ -346,25 +643,31 @@ async def get_resumefeedback_list(
                 (JobPosting.posting_id == ResumeFeedback.posting_id)
             )
             .outerjoin(Resume, (Resume.resume_id == ResumeFeedback.resume_id))
-            .where(
-                and_(
-                    ResumeFeedback.user_id == current_user.user_id,
-                    Resume.is_active == True,
-                )
-            )
+            .where(and_(*conditions))
             .group_by(
                 ResumeFeedback.feedback_id,
                 ResumeFeedback.matching_rate,
                 JobPosting.company,
                 Resume.title,
             )
-            .offset(offset)
-            .limit(page_size)
+            .order_by(desc(ResumeFeedback.created_at), desc(ResumeFeedback.feedback_id))
         )
 
+        if cursor is not None:
+            data_stmt = data_stmt.limit(page_size + 1)
+        else:
+            data_stmt = data_stmt.offset((page - 1) * page_size).limit(page_size)
+
         feedback_list = await db.execute(data_stmt)
         result = feedback_list.all()
 
+        if cursor is not None:
+            result, next_cursor = split_page(
+                result, page_size, "created_at", "feedback_id"
+            )
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
         return [
             ResumeFeedbackListResponse(
                 feedback_id=row.feedback_id,
@@ -430,9 +733,17 @@ async def delete_feedback(
                 status_code=status.HTTP_403_FORBIDDEN, detail="잘못된 접근입니다."
             )
 
+        await record_stat(
+            db=db,
+            user_id=current_user.user_id,
+            metric="feedbacks",
+            delta=-1,
+            at=feedback.created_at,
+        )
         await db.delete(feedback)
 
         await db.commit()
+        await invalidate_dashboard(current_user.user_id)
 
     except Exception as e:
         logger.error(f"error: {e}")
@@ -440,3 +751,10 @@ async def delete_feedback(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="피드백 삭제에 실패했습니다.",
         )
+
+
+@router.get("/cache/stats", response_model=LLMCacheStatsResponse)
+async def get_llm_cache_stats(current_user: User = Depends(get_current_user)):
+    """AI 응답 캐시 hit/miss 통계 조회 엔드포인트"""
+
+    return await get_cache_stats()
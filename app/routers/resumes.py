@@ -4,24 +4,48 @@ from datetime import datetime
 import json
 import logging
 import traceback
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from sqlalchemy import and_, delete, desc, update, select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Response,
+    UploadFile,
+    status,
+)
+from sqlalchemy import and_, desc, func, update, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from app.database import get_db
-from app.models.models import (
-    Activity,
-    Code,
-    Education,
-    Experience,
-    JobPosting,
-    Project,
-    Qualification,
-    Resume,
-    TechnologyStack,
-    User,
-)
+from app.models.models import JobPosting, Resume, User
 from app.models.models import File as FileModel
-from app.service.resume_service import get_resume_response
+from app.service.code_service import get_code_detail
+from app.service.activity_service import ACTION_RESUME_CREATE, record_activity
+from app.service.dashboard_service import invalidate_dashboard, record_stat
+from app.service.file_service import (
+    acquire_object,
+    attach_image_urls,
+    purge_objects,
+    release_objects,
+    remove_image_derivatives,
+    store_image,
+    store_image_derivatives,
+)
+from app.service.resume_service import (
+    RESUME_FIELDS,
+    get_resume_document,
+    get_resume_response,
+    insert_resume,
+    update_resume_children,
+)
+from app.service.pagination_service import (
+    NEXT_CURSOR_HEADER,
+    keyset_condition,
+    split_page,
+)
+from app.service.search_service import like_pattern, normalize_search_term
 from app.schema.schemas import (
     ResumeCreate,
     ResumeListResponse,
@@ -30,10 +54,8 @@ from app.schema.schemas import (
 )
 from app.security import get_current_user
 from app.storage_util.storage_util import (
-    delete_from_storage,
-    generate_presigned_url,
+    generate_presigned_urls,
     generate_unique_filename,
-    upload_to_image,
     validate_image_file,
 )
 
@@ -44,82 +66,95 @@ router = APIRouter(prefix="/resumes", tags=["Resumes"])
 
 @router.get("/", response_model=List[ResumeListResponse])
 async def get_all_resumes(
+    response: Response,
     title: Optional[str] = None,
     page: int = 1,
     page_size: int = 6,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """현재 사용자의 모든 이력서 목록 조회(검색)"""
-
-    offset = (page - 1) * page_size
-
-    title = title.strip() if title else None
-
-    if not title:
-        result = await db.execute(
-            select(
-                Resume.resume_id,
-                Resume.title,
-                Resume.created_at,
-                Resume.resume_type,
-                Code.code_detail.label("resume_type_detail"),
-                JobPosting.url,
-                JobPosting.end_date,
-            )
-            .outerjoin(
-                Code,
-                (Code.division == "resume_type")
-                & (Code.detail_id == Resume.resume_type),
-            )
-            .outerjoin(
-                JobPosting,
-                (JobPosting.posting_id == Resume.posting_id)
-                & (JobPosting.is_active == True),
-            )
-            .where(
-                and_(Resume.user_id == current_user.user_id, Resume.is_active == True)
+    """현재 사용자의 모든 이력서 목록 조회(검색)
+
+    cursor 파라미터가 있으면(첫 페이지는 빈 문자열) 최신순 커서 페이지네이션으로 조회하고,
+    다음 커서를 X-Next-Cursor 헤더로 반환한다. 없으면 기존 page 방식으로 조회한다.
+    """
+
+    title = normalize_search_term(title)
+
+    ThumbnailFile = aliased(FileModel)
+
+    conditions = [Resume.user_id == current_user.user_id, Resume.is_active == True]
+
+    if title:
+        conditions.append(Resume.title.ilike(like_pattern(title), escape="\\"))
+
+    stmt = (
+        select(
+            Resume.resume_id,
+            Resume.title,
+            Resume.created_at,
+            Resume.resume_type,
+            JobPosting.url,
+            JobPosting.end_date,
+            ThumbnailFile.file_key.label("thumbnail_key"),
+        )
+        .outerjoin(
+            JobPosting,
+            (JobPosting.posting_id == Resume.posting_id)
+            & (JobPosting.is_active == True),
+        )
+        .outerjoin(
+            ThumbnailFile,
+            (ThumbnailFile.fileable_id == Resume.resume_id)
+            & (ThumbnailFile.fileable_table == "resumes")
+            & (ThumbnailFile.purpose == "resume_thumbnail"),
+        )
+    )
+
+    if cursor is not None:
+        if cursor:
+            conditions.append(
+                keyset_condition(Resume.created_at, Resume.resume_id, cursor)
             )
-            .order_by(desc(Resume.created_at))
-            .offset(offset)
-            .limit(page_size)
+
+        stmt = (
+            stmt.where(and_(*conditions))
+            .order_by(desc(Resume.created_at), desc(Resume.resume_id))
+            .limit(page_size + 1)
         )
 
     else:
-        result = await db.execute(
-            select(
-                Resume.resume_id,
-                Resume.title,
-                Resume.created_at,
-                Resume.resume_type,
-                Code.code_detail.label("resume_type_detail"),
-                JobPosting.url,
-                JobPosting.end_date,
-            )
-            .outerjoin(
-                Code,
-                (Code.division == "resume_type")
-                & (Code.detail_id == Resume.resume_type),
-            )
-            .outerjoin(
-                JobPosting,
-                (JobPosting.posting_id == Resume.posting_id)
-                & (JobPosting.is_active == True),
-            )
-            .where(
-                and_(
-                    Resume.user_id == current_user.user_id,
-                    Resume.is_active == True,
-                    Resume.title.ilike(f"%{title}%"),
-                )
-            )
-            .order_by(desc(Resume.created_at))
-            .offset(offset)
+        order_by = [desc(Resume.created_at), desc(Resume.resume_id)]
+        if title:
+            order_by.insert(0, desc(func.similarity(Resume.title, title)))
+
+        stmt = (
+            stmt.where(and_(*conditions))
+            .order_by(*order_by)
+            .offset((page - 1) * page_size)
             .limit(page_size)
         )
 
+    result = await db.execute(stmt)
     rows = result.all()
-    return [row._asdict() for row in rows]
+
+    if cursor is not None:
+        rows, next_cursor = split_page(rows, page_size, "created_at", "resume_id")
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    # 썸네일 url은 페이지 단위로 한 번에 서명
+    thumbnail_urls = await generate_presigned_urls(row.thumbnail_key for row in rows)
+
+    return [
+        {
+            **row._asdict(),
+            "resume_type_detail": get_code_detail("resume_type", row.resume_type),
+            "thumbnail_url": thumbnail_urls.get(row.thumbnail_key),
+        }
+        for row in rows
+    ]
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
@@ -131,28 +166,29 @@ async def get_resume(
     """특정 이력서 상세 조회"""
 
     try:
-        resume = await db.get(Resume, resume_id)
+        document = await get_resume_document(db=db, resume_id=resume_id)
 
-        if resume is None:
+        if document is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="존재하지 않는 이력서 입니다.",
             )
 
-        if resume.user_id != current_user.user_id:
+        if document.get("user_id") != current_user.user_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 접근입니다."
             )
 
-        result = await get_resume_response(db=db, resume_id=resume_id)
+        await attach_image_urls(document)
 
-        image_url = await generate_presigned_url(result.get("image_key"))
-
-        db_resume = ResumeResponse.model_validate(result).model_dump()
-
-        db_resume["image_url"] = image_url
+        # 한 번만 검증하고 직렬화된 바이트를 그대로 반환 (response_model 재검증 생략)
+        return Response(
+            content=ResumeResponse.model_validate(document).model_dump_json(),
+            media_type="application/json",
+        )
 
-        return db_resume
+    except HTTPException:
+        raise
 
     except Exception as e:
         logger.error(f"error : {str(e)}")
@@ -281,83 +317,39 @@ async def create_resumes(
     try:
         resume_data = ResumeCreate(**json.loads(data))
 
-        new_resume = Resume(
-            user_id=current_user.user_id,
-            resume_type=resume_data.resume_type,
-            title=resume_data.title,
-            name=resume_data.name,
-            email=resume_data.email,
-            gender=resume_data.gender,
-            address=resume_data.address,
-            phone=resume_data.phone,
-            military_service=resume_data.military_service,
-            birth_date=resume_data.birth_date,
-            self_introduction=resume_data.self_introduction,
+        resume_id = await insert_resume(
+            db=db, data=resume_data, user_id=current_user.user_id
         )
-        db.add(new_resume)
-        await db.flush()
-        await db.refresh(new_resume)
-        for idx, technology_stack in enumerate(resume_data.technology_stacks):
-            new_tech = TechnologyStack(
-                resume_id=new_resume.resume_id, title=technology_stack.title
-            )
-            db.add(new_tech)
-
-        for experience in resume_data.experiences:
-            new_experience = Experience(
-                resume_id=new_resume.resume_id, **experience.model_dump()
-            )
-            db.add(new_experience)
-
-        for education in resume_data.educations:
-            new_education = Education(
-                resume_id=new_resume.resume_id, **education.model_dump()
-            )
-            db.add(new_education)
-
-        for project in resume_data.projects:
-            new_project = Project(
-                resume_id=new_resume.resume_id, **project.model_dump()
-            )
-            db.add(new_project)
-
-        for activity in resume_data.activities:
-            new_activity = Activity(
-                resume_id=new_resume.resume_id, **activity.model_dump()
-            )
-            db.add(new_activity)
-
-        for qualification in resume_data.qualifications:
-            new_qualification = Qualification(
-                resume_id=new_resume.resume_id, **qualification.model_dump()
-            )
-            db.add(new_qualification)
+        await record_stat(db=db, user_id=current_user.user_id, metric="resumes")
 
         if photo:
             validated: dict = await validate_image_file(photo)
 
-            upload_image = await upload_to_image(file=validated)
+            upload_image = await store_image(db=db, file=validated)
 
             new_image_file = FileModel(
-                fileable_id=new_resume.resume_id,
+                fileable_id=resume_id,
                 user_id=current_user.user_id,
                 filetype=validated.get("real_format"),
                 fileable_table="resumes",
                 org_file_name=validated.get("filename"),
                 mod_file_name=upload_image.get("unique_filename"),
                 file_key=upload_image.get("temp_key"),
+                content_hash=upload_image.get("content_hash"),
                 purpose="resume_image",
             )
             db.add(new_image_file)
-        await db.commit()
-        await db.commit()
 
-        resume_info = await get_resume_response(db=db, resume_id=new_resume.resume_id)
+            await store_image_derivatives(
+                db=db, file=validated, resume_id=resume_id, user_id=current_user.user_id
+            )
+        await db.commit()
+        await invalidate_dashboard(current_user.user_id)
+        record_activity(current_user.user_id, ACTION_RESUME_CREATE)
 
-        image_key = resume_info.get("image_key") if resume_info else None
-        image_url = await generate_presigned_url(image_key) if image_key else None
+        resume_info = await get_resume_response(db=db, resume_id=resume_id)
 
-        resume_info["image_url"] = image_url
+        await attach_image_urls(resume_info)
 
         resume_response = ResumeResponse.model_validate(resume_info).model_dump()
 
@@ -375,6 +367,7 @@ async def create_resumes(
 @router.put("/{resume_id}", response_model=ResumeResponse)
 async def update_resume(
     resume_id: int,
+    background_tasks: BackgroundTasks,
     data: str = Form(...),
     photo: UploadFile = File(None),
     db: AsyncSession = Depends(get_db),
@@ -398,107 +391,98 @@ async def update_resume(
 
         resume_data = ResumeUpdate(**json.loads(data))
 
-        for c in [
-            "title",
-            "name",
-            "email",
-            "gender",
-            "address",
-            "phone",
-            "military_service",
-            "birth_date",
-            "self_introduction",
-        ]:
+        fields_changed = any(
+            getattr(resume, c) != getattr(resume_data, c) for c in RESUME_FIELDS
+        )
+        for c in RESUME_FIELDS:
             setattr(resume, c, getattr(resume_data, c))
-        resume.updated_at = datetime.utcnow()
 
-        tech_stmt = delete(TechnologyStack).where(
-            TechnologyStack.resume_id == resume_id
-        )
-        experience_stmt = delete(Experience).where(Experience.resume_id == resume_id)
-        education_stmt = delete(Education).where(Education.resume_id == resume_id)
-        project_stmt = delete(Project).where(Project.resume_id == resume_id)
-        activity_stmt = delete(Activity).where(Activity.resume_id == resume_id)
-        qualification_stmt = delete(Qualification).where(
-            Qualification.resume_id == resume_id
+        # 바뀐 자식 행만 반영 - 변경 없는 저장은 자식 테이블에 쓰기를 하지 않는다
+        children_changed = await update_resume_children(
+            db=db, resume_id=resume_id, data=resume_data
         )
 
-        for i in [
-            tech_stmt,
-            experience_stmt,
-            education_stmt,
-            project_stmt,
-            activity_stmt,
-            qualification_stmt,
-        ]:
-            await db.execute(i)
-
-        for technology_stack in resume_data.technology_stacks:
-            new_tech = TechnologyStack(
-                resume_id=resume_id, title=technology_stack.title
-            )
-            db.add(new_tech)
-
-        for experience in resume_data.experiences:
-            new_experience = Experience(resume_id=resume_id, **experience.model_dump())
-            db.add(new_experience)
-
-        for education in resume_data.educations:
-            new_education = Education(resume_id=resume_id, **education.model_dump())
-            db.add(new_education)
-
-        for project in resume_data.projects:
-            new_project = Project(resume_id=resume_id, **project.model_dump())
-            db.add(new_project)
-
-        for activity in resume_data.activities:
-            new_activity = Activity(resume_id=resume_id, **activity.model_dump())
-            db.add(new_activity)
+        if fields_changed or children_changed or photo:
+            resume.updated_at = datetime.utcnow()
 
-        for qualification in resume_data.qualifications:
-            new_qualification = Qualification(
-                resume_id=resume_id, **qualification.model_dump()
-            )
-            db.add(new_qualification)
-
-        resume_info = await get_resume_response(resume_id=resume_id, db=db)
-        image_key = resume_info.get("image_key") if resume_info else None
+        # 다른 이력서와 공유 중인 이미지일 수 있으므로 마지막 참조일 때만 commit 후 삭제
+        stale_keys = []
 
         if photo:
-            if image_key:
-                await delete_from_storage(image_key)
-
             validated: dict = await validate_image_file(photo)
 
-            upload_image = await upload_to_image(file=validated)
+            # 새 이미지를 먼저 참조한 뒤 기존 이미지를 놓아야 같은 내용을 다시 올려도 지워지지 않는다
+            upload_image = await store_image(db=db, file=validated)
 
-            await db.execute(
-                update(FileModel)
-                .where(
+            result = await db.execute(
+                select(FileModel.file_key).where(
                     and_(
                         FileModel.fileable_id == resume_id,
                         FileModel.purpose == "resume_image",
                     )
                 )
-                .values(
-                    filetype=validated.get("real_format"),
-                    org_file_name=validated.get("filename"),
-                    mod_file_name=upload_image.get("unique_filename"),
-                    file_key=upload_image.get("temp_key"),
+            )
+            old_keys = list(result.scalars().all())
+
+            image_values = dict(
+                filetype=validated.get("real_format"),
+                org_file_name=validated.get("filename"),
+                mod_file_name=upload_image.get("unique_filename"),
+                file_key=upload_image.get("temp_key"),
+                content_hash=upload_image.get("content_hash"),
+            )
+
+            if old_keys:
+                await db.execute(
+                    update(FileModel)
+                    .where(
+                        and_(
+                            FileModel.fileable_id == resume_id,
+                            FileModel.purpose == "resume_image",
+                        )
+                    )
+                    .values(**image_values)
+                )
+
+                # 바뀐 files 행마다 새 이미지의 참조가 하나씩 필요하다
+                for _ in old_keys[1:]:
+                    await acquire_object(db=db, file_key=upload_image.get("temp_key"))
+
+            else:
+                # 사진 없이 만든 이력서 - create_resumes 와 같이 새 행을 만든다
+                db.add(
+                    FileModel(
+                        fileable_id=resume_id,
+                        user_id=current_user.user_id,
+                        fileable_table="resumes",
+                        purpose="resume_image",
+                        **image_values,
+                    )
                 )
+
+            old_keys += await remove_image_derivatives(db=db, resume_id=resume_id)
+            await store_image_derivatives(
+                db=db, file=validated, resume_id=resume_id, user_id=current_user.user_id
             )
 
-            image_url = await generate_presigned_url(upload_image.get("temp_key"))
-        else:
-            image_url = await generate_presigned_url(image_key) if image_key else None
+            stale_keys = await release_objects(db=db, file_keys=old_keys)
+
+        # 아래 조회가 세션의 변경 사항을 덮어쓰지 않도록 먼저 반영
+        await db.flush()
+
+        resume_info = await get_resume_response(resume_id=resume_id, db=db)
 
         await db.commit()
+        await invalidate_dashboard(current_user.user_id)
 
-        # image_url을 resume_info에 추가
-        resume_info["image_url"] = image_url
+        await attach_image_urls(resume_info)
 
         resume_response = ResumeResponse.model_validate(resume_info).model_dump()
 
+        # 스토리지 정리는 응답을 보낸 뒤 별도 세션에서 - 실패해도 수정 결과는 바뀌지 않는다
+        if stale_keys:
+            background_tasks.add_task(purge_objects, stale_keys)
+
         return resume_response
 
     except Exception as e:
@@ -532,9 +516,19 @@ async def deactivate_resume(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 접근입니다."
             )
 
+        if resume.is_active:
+            await record_stat(
+                db=db,
+                user_id=current_user.user_id,
+                metric="resumes",
+                delta=-1,
+                at=resume.created_at,
+            )
+
         resume.is_active = False
 
         await db.commit()
+        await invalidate_dashboard(current_user.user_id)
 
     except Exception as e:
         logger.error(f"error : {str(e)}")
@@ -7,7 +7,9 @@ from app.database import get_db
 from app.models.models import JobPosting, Resume, User
 from app.models.models import User, JobPosting, Resume
 from app.schema.schemas import UserInfo, UserProfileResponse, UserProfileUpdate
-from app.security import get_current_user
+from app.security import get_current_user, revoke_user_tokens
+from app.service.activity_service import ACTION_WITHDRAW, record_activity
+from app.service.user_cache_service import invalidate_user
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +69,8 @@ async def update_profile(
         
         await db.commit()
         await db.refresh(current_user)
+
+        await invalidate_user(current_user.unique_id)
         
         return {
             "name": current_user.name,   
@@ -104,4 +108,9 @@ async def withdraw_user(db: AsyncSession = Depends(get_db), current_user: User =
 
     await db.commit()
 
+    await invalidate_user(user.unique_id)
+    await revoke_user_tokens(user.unique_id)
+
+    record_activity(user.user_id, ACTION_WITHDRAW)
+
     return
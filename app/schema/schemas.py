@@ -170,9 +170,28 @@ class TechnologyStackCreate(BaseModel):
         return v
 
 
+class ExperienceUpdate(ExperienceCreate):
+    experience_id : Optional[int] = Field(None, description="기존 경력 id, 없으면 새로 추가")
+
+class EducationUpdate(EducationCreate):
+    education_id : Optional[int] = Field(None, description="기존 학력 id, 없으면 새로 추가")
+
+class ProjectUpdate(ProjectCreate):
+    project_id : Optional[int] = Field(None, description="기존 프로젝트 id, 없으면 새로 추가")
+
+class ActivityUpdate(ActivityCreate):
+    activity_id : Optional[int] = Field(None, description="기존 활동 id, 없으면 새로 추가")
+
+class QualificationUpdate(QualificationCreate):
+    qualification_id : Optional[int] = Field(None, description="기존 자격증 id, 없으면 새로 추가")
+
+class TechnologyStackUpdate(TechnologyStackCreate):
+    technology_stack_id : Optional[int] = Field(None, description="기존 기술스택 id, 없으면 새로 추가")
+
 
 
 class ExperienceResponse(BaseModel):
+    experience_id : Optional[int] = None
     job_title : str
     department: str
     position : Optional[str] = None
@@ -186,6 +205,7 @@ class ExperienceResponse(BaseModel):
     
 
 class EducationResponse(BaseModel):
+    education_id : Optional[int] = None
     organ : str
     department : str
     degree_level : Optional[str] = None
@@ -199,6 +219,7 @@ class EducationResponse(BaseModel):
     
 
 class ProjectResponse(BaseModel):
+    project_id : Optional[int] = None
     title : str
     start_date : date
     end_date: Optional[date] = None
@@ -209,6 +230,7 @@ class ProjectResponse(BaseModel):
     
 
 class ActivityResponse(BaseModel):
+    activity_id : Optional[int] = None
     title : str
     start_date : date
     end_date: Optional[date] = None
@@ -217,6 +239,7 @@ class ActivityResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
 class QualificationResponse(BaseModel):
+    qualification_id : Optional[int] = None
     title : str
     acquisition_date : date
     score : Optional[str] = None
@@ -227,6 +250,7 @@ class QualificationResponse(BaseModel):
 
 
 class TechnologyStackResponse(BaseModel):
+    technology_stack_id : Optional[int] = None
     title : str
 
     model_config = ConfigDict(from_attributes=True)
@@ -272,14 +296,14 @@ class ResumeUpdate(BaseModel):
     military_service : Optional[str] = Field(None, max_length=10)
     birth_date : Optional[date] = None
     self_introduction: Optional[str] = None
-    technology_stacks: Optional[List[TechnologyStackCreate]] = Field(default_factory=list)
+    technology_stacks: Optional[List[TechnologyStackUpdate]] = Field(default_factory=list)
 
 
-    experiences: Optional[List[ExperienceCreate]] = Field(default_factory=list)
-    educations: Optional[List[EducationCreate]] = Field(default_factory=list)
-    projects: Optional[List[ProjectCreate]] = Field(default_factory=list)
-    activities: Optional[List[ActivityCreate]] = Field(default_factory=list)
-    qualifications: Optional[List[QualificationCreate]] = Field(default_factory=list)
+    experiences: Optional[List[ExperienceUpdate]] = Field(default_factory=list)
+    educations: Optional[List[EducationUpdate]] = Field(default_factory=list)
+    projects: Optional[List[ProjectUpdate]] = Field(default_factory=list)
+    activities: Optional[List[ActivityUpdate]] = Field(default_factory=list)
+    qualifications: Optional[List[QualificationUpdate]] = Field(default_factory=list)
 
     @field_validator('title', 'name', 'address', 'gender', 'phone', 'military_service', 'self_introduction')
     @classmethod
@@ -310,6 +334,7 @@ class ResumeResponse(BaseModel):
     qualifications: Optional[List[QualificationResponse]] = Field(default_factory=list)
     
     image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     portfolio_url: Optional[str] = None
 
 
@@ -323,6 +348,7 @@ class ResumeListResponse(BaseModel):
     resume_type_detail : str
     url : Optional[str]
     end_date : Optional[datetime]
+    thumbnail_url : Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -492,5 +518,21 @@ class ResumeFeedbackListResponse(BaseModel):
     matching_rate : int
     
     model_config = ConfigDict(from_attributes=True)
-    
 
+
+
+class FeedbackJobResponse(BaseModel):
+    """피드백 생성 작업 상태 응답"""
+
+    job_id : str
+    status : Literal['queued', 'running', 'done', 'failed']
+    feedback : Optional[ResumeFeedbackResponse] = None
+    error : Optional[str] = None
+
+
+class LLMCacheStatsResponse(BaseModel):
+    """AI 응답 캐시 통계"""
+
+    hits : int
+    misses : int
+    entries : int
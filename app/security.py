@@ -2,16 +2,21 @@ from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError,jwt
+import logging
 import secrets
 import os
+import time
 
-from sqlalchemy import select
 from app.database import get_db
 from app.service.login_service import get_user_by_id
+from app.service.activity_service import touch_user
+from app.service.user_cache_service import get_cached_user
 from app.config.settings import settings
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.models import User
+from app.redis_client.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
 
 SECRET_KEY=settings.jwt_secret
 ALGORITHM=settings.jwt_algorithm
@@ -22,7 +27,8 @@ def create_access_token(data:dict):
     
     to_encode = data.copy()
     expire = datetime.utcnow()+timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp":expire})
+    # 탈퇴 시각과 같은 초에 발급된 토큰을 구분하도록 iat 는 밀리초까지 기록
+    to_encode.update({"exp":expire, "iat": round(time.time(), 3), "jti": secrets.token_urlsafe(16)})
     encode_jwt = jwt.encode(to_encode,SECRET_KEY,algorithm=ALGORITHM)
     
     return encode_jwt
@@ -38,28 +44,100 @@ def verify_token(token:str):
         return None
 
 
+def _revoked_token_key(jti: str) -> str:
+    return f"revoked_token:{jti}"
+
+
+def _revoked_user_key(unique_id: str) -> str:
+    return f"revoked_user:{unique_id}"
+
 
+async def revoke_token(payload: dict):
+    """토큰 하나를 남은 유효시간 동안 블랙리스트에 등록 (로그아웃)
 
+    등록하지 못하면 토큰이 계속 유효하므로 성공으로 응답하지 않고 503 을 반환한다.
+    """
 
+    jti = payload.get("jti")
+    if not jti:
+        return
+
+    ttl = max(int(payload.get("exp", 0) - time.time()), 1)
+
+    try:
+        await redis_client.set(_revoked_token_key(jti), 1, ex=ttl)
+
+    except Exception as e:
+        logger.error(f"token revoke error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="잠시 후 다시 시도해 주세요.",
+        )
+
+
+async def revoke_user_tokens(unique_id: str) -> bool:
+    """해당 시각 이전에 발급된 사용자의 모든 토큰을 무효화 (회원 탈퇴)
+
+    탈퇴는 이미 DB 에 반영된 뒤 호출되고, 비활성 사용자는 get_current_user 에서 401 로 막히므로
+    Redis 오류는 기록만 하고 False 를 반환한다.
+    """
+
+    try:
+        await redis_client.set(
+            _revoked_user_key(unique_id),
+            time.time(),
+            ex=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    except Exception as e:
+        logger.error(f"user tokens revoke error: {e}")
+        return False
+
+    return True
+
+
+async def is_token_revoked(payload: dict) -> bool:
+    """토큰(jti)과 사용자 단위 블랙리스트를 MGET 한 번으로 확인"""
+
+    jti = payload.get("jti") or ""
+
+    try:
+        revoked_token, revoked_before = await redis_client.mget(
+            _revoked_token_key(jti), _revoked_user_key(payload.get("sub"))
+        )
+
+    except Exception as e:
+        # Redis 장애 시 인증 전체가 막히지 않도록 통과시킴
+        logger.warning(f"token blacklist check error: {e}")
+        return False
+
+    if jti and revoked_token:
+        return True
+
+    return revoked_before is not None and payload.get("iat", 0) < float(revoked_before)
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='token')
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db : AsyncSession = Depends(get_db)):
-    '''현재 사용자정보를 가져오는 함수, 추후 레디스 블랙리스트로 필터링 기능 추가'''
+    '''현재 사용자정보를 가져오는 함수, 레디스 블랙리스트로 폐기된 토큰과 탈퇴한 사용자 필터링'''
     payload = verify_token(token)
     if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="유효하지 않은 토큰 입니다.")
-    payload.get('sub')
-                
-    stmt = select(User).where(User.unique_id == payload.get('sub'))
 
-    user = await db.execute(stmt)
+    if await is_token_revoked(payload):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="만료된 토큰 입니다.")
 
-    user = user.scalar_one_or_none()
+    user = await get_cached_user(db, payload.get('sub'))
     
     if not user: 
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail = "사용자를 찾을 수 없습니다.")
+
+    # 블랙리스트 확인은 Redis 장애 시 통과되므로 탈퇴 여부는 사용자 정보로 한 번 더 확인
+    if user.is_active == False:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="탈퇴한 사용자입니다.")
+
+    touch_user(user.user_id)
     
     return user
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import Integer, TIMESTAMP, column, func, insert, update, values
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import settings
+from app.database import AsyncSessionLocal
+from app.models.models import User, UserActivityLog
+from app.service.code_service import get_code_detail
+
+logger = logging.getLogger(__name__)
+
+# codes 테이블 action_type 의 detail_id
+ACTION_RESUME_CREATE = "1"
+ACTION_SIGNUP = "2"
+ACTION_LOGIN = "3"
+ACTION_LOGOUT = "4"
+ACTION_WITHDRAW = "5"
+ACTION_INTERVIEW = "6"
+ACTION_GUIDE = "7"
+ACTION_FEEDBACK_CREATE = "8"
+
+# 프로세스 내 쓰기 버퍼 - 요청 처리 중에는 메모리에만 쌓고 주기적으로 한 번에 기록한다
+_activity_buffer: List[dict] = []
+_last_accessed_buffer: Dict[int, datetime] = {}
+_flush_requested: Optional[asyncio.Event] = None
+_stopping = False
+
+
+def _get_flush_event() -> asyncio.Event:
+    global _flush_requested
+
+    if _flush_requested is None:
+        _flush_requested = asyncio.Event()
+
+    return _flush_requested
+
+
+def touch_user(user_id: int):
+    """users.last_accessed 갱신을 버퍼에 기록하는 함수 (DB 왕복 없음)"""
+
+    _last_accessed_buffer[user_id] = datetime.now(timezone.utc)
+
+
+def record_activity(
+    user_id: int,
+    action_type: str,
+    description: Optional[str] = None,
+    ip_address: Optional[str] = None,
+):
+    """활동 로그를 버퍼에 쌓는 함수 (DB 왕복 없음) - 본 작업 commit 후 호출한다"""
+
+    now = datetime.now(timezone.utc)
+
+    _activity_buffer.append(
+        {
+            "user_id": user_id,
+            "action_type": action_type,
+            "description": description or get_code_detail("action_type", action_type),
+            "ip_address": ip_address,
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    _last_accessed_buffer[user_id] = now
+
+    if len(_activity_buffer) >= settings.activity_buffer_max_size:
+        _get_flush_event().set()
+
+
+async def _write_accessed(db: AsyncSession, accessed: Dict[int, datetime]):
+    touched = values(
+        column("user_id", Integer),
+        column("last_accessed", TIMESTAMP(timezone=True)),
+        name="touched",
+    ).data(list(accessed.items()))
+
+    # 여러 워커가 기록하므로 더 최근 시각만 반영
+    await db.execute(
+        update(User)
+        .where(User.user_id == touched.c.user_id)
+        .values(last_accessed=func.greatest(User.last_accessed, touched.c.last_accessed))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _write_rows(events: List[dict], accessed: Dict[int, datetime]):
+    """배치에 기록할 수 없는 행이 섞였을 때 한 행씩 savepoint 로 기록하는 함수
+
+    FK 위반(탈퇴 후 삭제된 사용자)이나 잘못된 값처럼 다시 시도해도 실패할 행만 로그를 남기고 버린다.
+    """
+
+    async with AsyncSessionLocal() as db:
+        for event in events:
+            try:
+                async with db.begin_nested():
+                    await db.execute(insert(UserActivityLog).values(event))
+
+            except (IntegrityError, DataError) as e:
+                logger.warning(f"activity log dropped: {event}: {e}")
+
+        if accessed:
+            try:
+                async with db.begin_nested():
+                    await _write_accessed(db, accessed)
+
+            except (IntegrityError, DataError) as e:
+                logger.warning(f"last_accessed update dropped: {e}")
+
+        await db.commit()
+
+
+async def flush_activity():
+    """버퍼에 쌓인 활동 로그와 last_accessed 를 multi-row 쓰기 두 번으로 기록하는 함수"""
+
+    global _activity_buffer, _last_accessed_buffer
+
+    if not _activity_buffer and not _last_accessed_buffer:
+        return
+
+    events, _activity_buffer = _activity_buffer, []
+    accessed, _last_accessed_buffer = _last_accessed_buffer, {}
+
+    try:
+        try:
+            async with AsyncSessionLocal() as db:
+                if events:
+                    await db.execute(insert(UserActivityLog).values(events))
+
+                if accessed:
+                    await _write_accessed(db, accessed)
+
+                await db.commit()
+
+        except (IntegrityError, DataError) as e:
+            # 다시 시도해도 같은 행 때문에 실패하므로 되돌리지 않고 한 행씩 기록해 그 행만 걸러낸다
+            logger.warning(f"activity batch rejected, retrying row by row: {e}")
+            await _write_rows(events, accessed)
+
+    except asyncio.CancelledError:
+        # 버퍼에서 꺼낸 배치를 잃지 않도록 되돌린 뒤 취소를 전파
+        _requeue(events, accessed)
+        raise
+
+    except Exception as e:
+        # 연결 오류 등 일시적인 실패만 다음 flush 에서 다시 시도
+        logger.warning(f"activity flush error: {e}")
+        _requeue(events, accessed)
+
+
+def _requeue(events: List[dict], accessed: Dict[int, datetime]):
+    """기록하지 못한 배치를 버퍼 앞에 되돌리는 함수 - 버퍼 크기 이상은 버린다"""
+
+    _activity_buffer[:0] = events[-settings.activity_buffer_max_size :]
+    for user_id, at in accessed.items():
+        _last_accessed_buffer.setdefault(user_id, at)
+
+
+async def run_activity_flusher():
+    """activity_flush_interval 마다 (또는 버퍼가 차면 즉시) 버퍼를 비우는 백그라운드 루프"""
+
+    event = _get_flush_event()
+
+    while not _stopping:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=settings.activity_flush_interval)
+        except asyncio.TimeoutError:
+            pass
+
+        event.clear()
+        await flush_activity()
+
+
+async def stop_activity_flusher(task: asyncio.Task):
+    """종료 시 백그라운드 루프를 멈추고 남은 버퍼를 기록하는 함수
+
+    진행 중인 flush 를 취소하지 않고 루프가 스스로 끝나기를 기다린다.
+    """
+
+    global _stopping
+
+    _stopping = True
+    _get_flush_event().set()
+
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+    await flush_activity()
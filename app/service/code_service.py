@@ -0,0 +1,43 @@
+import logging
+from types import MappingProxyType
+from typing import Mapping, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
+from app.models.models import Code
+
+logger = logging.getLogger(__name__)
+
+# (division, detail_id) -> code_detail, 프로세스 전역 읽기 전용 테이블
+_code_registry: Mapping[tuple, str] = MappingProxyType({})
+
+
+async def load_codes(db: AsyncSession):
+    """codes 테이블 전체를 읽어 코드 레지스트리를 교체하는 함수"""
+
+    global _code_registry
+
+    result = await db.execute(select(Code))
+    codes = result.scalars().all()
+
+    _code_registry = MappingProxyType(
+        {(code.division, code.detail_id): code.code_detail for code in codes}
+    )
+
+    logger.info(f"{len(codes)}개의 코드를 불러왔습니다.")
+
+
+async def reload_codes():
+    """codes 테이블이 바뀌었을 때 호출하는 리로드 훅"""
+
+    async with AsyncSessionLocal() as db:
+        await load_codes(db)
+
+
+def get_code_detail(division: str, detail_id: Optional[str]) -> Optional[str]:
+    """(division, detail_id)에 해당하는 code_detail 반환"""
+
+    if detail_id is None:
+        return None
+
+    return _code_registry.get((division, detail_id))
@@ -0,0 +1,221 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import JSON, and_, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import settings
+from app.models.models import Resume, UserActivityLog, UserDailyStat, UserStat
+from app.redis_client.redis_client import redis_client
+from app.service.activity_service import ACTION_LOGIN
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_CACHE_PREFIX = "dashboard"
+
+# 일 단위 버킷 컬럼 -> 누적 카운터 컬럼 (피드백은 누적값을 쓰지 않는다)
+STAT_TOTALS = {
+    "resumes": "total_resumes",
+    "feedbacks": None,
+    "job_postings": "total_job_postings",
+}
+
+STAT_WINDOW_DAYS = 7
+RECENT_ITEMS = 3
+
+STAT_COLUMNS = (
+    "total_resumes",
+    "total_job_postings",
+    "this_week_resumes",
+    "this_week_ai_feedback",
+    "this_week_job_postings",
+)
+
+
+def _dashboard_key(user_id: int) -> str:
+    return f"{DASHBOARD_CACHE_PREFIX}:{user_id}"
+
+
+def _stat_day(at: Optional[datetime]) -> date:
+    """이벤트 시각을 UTC 기준 날짜 버킷으로 변환"""
+
+    if at is None:
+        return datetime.now(timezone.utc).date()
+
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+
+    return at.astimezone(timezone.utc).date()
+
+
+async def record_stat(
+    db: AsyncSession,
+    user_id: int,
+    metric: str,
+    delta: int = 1,
+    at: Optional[datetime] = None,
+):
+    """이력서/피드백/공고 생성(+1)·삭제(-1)를 대시보드 카운터에 반영하는 함수
+
+    호출 측 트랜잭션 안에서 실행되므로 본 쓰기와 함께 commit/rollback 된다.
+    삭제 시에는 원래 생성 시각(at)의 버킷에서 뺀다.
+    """
+
+    counts = {"resumes": 0, "feedbacks": 0, "job_postings": 0, metric: delta}
+    daily = (
+        insert(UserDailyStat)
+        .values(user_id=user_id, day=_stat_day(at), **counts)
+        .on_conflict_do_update(
+            index_elements=[UserDailyStat.user_id, UserDailyStat.day],
+            set_={metric: getattr(UserDailyStat, metric) + delta},
+        )
+    )
+    await db.execute(daily)
+
+    total = STAT_TOTALS[metric]
+    if total is None:
+        return
+
+    counts = {"total_resumes": 0, "total_job_postings": 0, total: delta}
+    totals = (
+        insert(UserStat)
+        .values(user_id=user_id, **counts)
+        .on_conflict_do_update(
+            index_elements=[UserStat.user_id],
+            set_={total: getattr(UserStat, total) + delta},
+        )
+    )
+    await db.execute(totals)
+
+
+def _recent_json(recent, *columns):
+    """최근 항목 서브쿼리를 created_at 최신순 JSON 배열로 집계하는 스칼라 서브쿼리"""
+
+    row_json = func.json_build_object(
+        *[item for column in columns for item in (literal_column(f"'{column.key}'"), column)]
+    )
+
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(row_json, recent.c.created_at.desc())),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        )
+        .select_from(recent)
+        .scalar_subquery()
+    )
+
+
+async def get_dashboard_data(db: AsyncSession, user_id: int) -> dict:
+    """누적 카운터, 최근 7일 버킷 합계, 최근 이력서/활동을 한 번의 왕복으로 가져오는 함수"""
+
+    window_start = datetime.now(timezone.utc).date() - timedelta(days=STAT_WINDOW_DAYS - 1)
+
+    week = (
+        select(
+            func.coalesce(func.sum(UserDailyStat.resumes), 0).label("this_week_resumes"),
+            func.coalesce(func.sum(UserDailyStat.feedbacks), 0).label("this_week_ai_feedback"),
+            func.coalesce(func.sum(UserDailyStat.job_postings), 0).label("this_week_job_postings"),
+        )
+        .where(and_(UserDailyStat.user_id == user_id, UserDailyStat.day >= window_start))
+        .subquery()
+    )
+
+    recent_resumes = (
+        select(
+            Resume.resume_id,
+            Resume.title,
+            func.coalesce(Resume.updated_at, Resume.created_at).label("updated_at"),
+            Resume.created_at,
+        )
+        .where(and_(Resume.user_id == user_id, Resume.is_active == True))
+        .order_by(Resume.created_at.desc())
+        .limit(RECENT_ITEMS)
+        .subquery()
+    )
+
+    # 로그인 기록은 최근 활동에 보여주지 않는다
+    recent_activities = (
+        select(
+            UserActivityLog.action_type,
+            UserActivityLog.description,
+            UserActivityLog.created_at,
+        )
+        .where(
+            and_(
+                UserActivityLog.user_id == user_id,
+                UserActivityLog.action_type != ACTION_LOGIN,
+            )
+        )
+        .order_by(UserActivityLog.created_at.desc())
+        .limit(RECENT_ITEMS)
+        .subquery()
+    )
+
+    stmt = (
+        select(
+            func.coalesce(UserStat.total_resumes, 0).label("total_resumes"),
+            func.coalesce(UserStat.total_job_postings, 0).label("total_job_postings"),
+            week.c.this_week_resumes,
+            week.c.this_week_ai_feedback,
+            week.c.this_week_job_postings,
+            _recent_json(
+                recent_resumes,
+                recent_resumes.c.resume_id,
+                recent_resumes.c.title,
+                recent_resumes.c.updated_at,
+            ).label("recent_resumes"),
+            _recent_json(
+                recent_activities,
+                recent_activities.c.action_type,
+                recent_activities.c.description,
+                recent_activities.c.created_at,
+            ).label("recent_activities"),
+        )
+        .select_from(week)
+        .outerjoin(UserStat, UserStat.user_id == user_id)
+    )
+
+    result = await db.execute(stmt)
+    row = result.one()._asdict()
+
+    return {
+        **{key: int(value) for key, value in row.items() if key in STAT_COLUMNS},
+        "recent_resumes": row["recent_resumes"],
+        "recent_activities": row["recent_activities"],
+    }
+
+
+async def get_cached_dashboard(user_id: int) -> Optional[str]:
+    """캐시된 대시보드 응답(JSON) 조회"""
+
+    try:
+        return await redis_client.get(_dashboard_key(user_id))
+
+    except Exception as e:
+        logger.warning(f"dashboard cache get error: {e}")
+        return None
+
+
+async def set_cached_dashboard(user_id: int, content: str):
+    """대시보드 응답(JSON)을 캐시에 저장"""
+
+    try:
+        await redis_client.set(
+            _dashboard_key(user_id), content, ex=settings.dashboard_cache_ttl
+        )
+
+    except Exception as e:
+        logger.warning(f"dashboard cache set error: {e}")
+
+
+async def invalidate_dashboard(user_id: int):
+    """이력서/피드백/공고가 바뀌었을 때 commit 후 호출하는 캐시 무효화 함수"""
+
+    try:
+        await redis_client.delete(_dashboard_key(user_id))
+
+    except Exception as e:
+        logger.warning(f"dashboard cache delete error: {e}")
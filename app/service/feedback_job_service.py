@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import settings
+from app.models.models import JobPosting
+from app.redis_client.redis_client import redis_client
+from app.schema.schemas import JobPostingResponse, ResumeResponse
+from app.service.llm_limit_service import PRIORITY_BACKGROUND
+from app.service.resume_feedback_service import (
+    resume_feedback_with_posting,
+    resume_standard_feedback,
+    save_resume_feedback,
+)
+from app.service.resume_service import get_resume_response
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_JOB_QUEUE = "feedback_jobs"
+# 워커가 꺼낸 작업은 완료(ack) 전까지 이 리스트에 남아 있다가, 워커가 죽으면 큐로 되돌아간다
+FEEDBACK_JOB_PROCESSING = f"{FEEDBACK_JOB_QUEUE}:processing"
+
+# processing 에서 빠진 경우에만 큐 맨 앞(다음에 꺼낼 위치)으로 되돌리는 스크립트
+REQUEUE_SCRIPT = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+_requeue_script = redis_client.register_script(REQUEUE_SCRIPT)
+
+
+def job_key(job_id: str) -> str:
+    """작업 상태를 저장할 Redis 키"""
+
+    return f"feedback_job:{job_id}"
+
+
+async def enqueue_feedback_job(
+    user_id: int,
+    resume_id: int,
+    posting_id: Optional[int] = None,
+    refresh: bool = False,
+) -> str:
+    """피드백 생성 작업을 큐에 등록하고 작업 id를 반환하는 함수"""
+
+    job_id = uuid4().hex
+    job = {
+        "job_id": job_id,
+        "status": "queued",
+        "user_id": user_id,
+        "resume_id": resume_id,
+        "posting_id": posting_id or "",
+        "refresh": int(refresh),
+    }
+
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_key(job_id), mapping=job)
+        pipe.expire(job_key(job_id), settings.feedback_job_ttl)
+        pipe.lpush(FEEDBACK_JOB_QUEUE, job_id)
+        await pipe.execute()
+
+    return job_id
+
+
+async def get_feedback_job(job_id: str) -> Optional[dict]:
+    """작업 상태를 조회하는 함수"""
+
+    job = await redis_client.hgetall(job_key(job_id))
+
+    if not job:
+        return None
+
+    job["user_id"] = int(job["user_id"])
+    job["resume_id"] = int(job["resume_id"])
+    job["posting_id"] = int(job["posting_id"]) if job.get("posting_id") else None
+    job["feedback_id"] = int(job["feedback_id"]) if job.get("feedback_id") else None
+    job["refresh"] = job.get("refresh") == "1"
+
+    return job
+
+
+async def set_feedback_job_status(job_id: str, status: str, **fields):
+    """작업 상태를 갱신하는 함수"""
+
+    await redis_client.hset(job_key(job_id), mapping={"status": status, **fields})
+
+
+async def claim_feedback_job(timeout: int = 1) -> Optional[str]:
+    """큐에서 작업 id 를 꺼내 processing 리스트로 옮기는 함수 - 없으면 None"""
+
+    return await redis_client.blmove(
+        FEEDBACK_JOB_QUEUE, FEEDBACK_JOB_PROCESSING, timeout, src="RIGHT", dest="LEFT"
+    )
+
+
+async def ack_feedback_job(job_id: str):
+    """처리가 끝난(성공/실패) 작업을 processing 리스트에서 지우는 함수"""
+
+    await redis_client.lrem(FEEDBACK_JOB_PROCESSING, 1, job_id)
+
+
+async def requeue_stale_jobs() -> int:
+    """visibility timeout 이 지나도록 ack 되지 않은 작업을 큐로 되돌리는 함수
+
+    최대 시도 횟수를 넘긴 작업은 failed 로 처리하고, 되돌린 작업 수를 반환한다.
+    """
+
+    requeued = 0
+    now = time.time()
+
+    for job_id in await redis_client.lrange(FEEDBACK_JOB_PROCESSING, 0, -1):
+        job = await redis_client.hgetall(job_key(job_id))
+
+        # TTL 로 사라졌거나, 결과는 기록했지만 ack 전에 죽은 작업
+        if not job or job.get("status") in ("done", "failed"):
+            await ack_feedback_job(job_id)
+            continue
+
+        # running 으로 바꾸기 전에 죽은 경우 - 지금부터 시간을 잰다
+        if not job.get("claimed_at"):
+            await redis_client.hset(job_key(job_id), "claimed_at", now)
+            continue
+
+        if now - float(job["claimed_at"]) < settings.feedback_job_visibility_timeout:
+            continue
+
+        attempts = int(job.get("attempts") or 0) + 1
+
+        if attempts >= settings.feedback_job_max_attempts:
+            await set_feedback_job_status(
+                job_id, "failed", attempts=attempts, error="피드백 생성에 실패했습니다."
+            )
+            await ack_feedback_job(job_id)
+            continue
+
+        if await _requeue_script(
+            keys=[FEEDBACK_JOB_PROCESSING, FEEDBACK_JOB_QUEUE], args=[job_id]
+        ):
+            await redis_client.hset(
+                job_key(job_id),
+                mapping={"status": "queued", "attempts": attempts, "claimed_at": ""},
+            )
+            logger.warning(f"feedback job {job_id} requeued (attempt {attempts})")
+            requeued += 1
+
+    return requeued
+
+
+async def run_job_reaper():
+    """feedback_job_reap_interval 마다 멈춘 작업을 큐로 되돌리는 백그라운드 루프"""
+
+    while True:
+        await asyncio.sleep(settings.feedback_job_reap_interval)
+
+        try:
+            await requeue_stale_jobs()
+
+        except Exception as e:
+            logger.warning(f"feedback job reaper error: {e}")
+
+
+async def run_feedback_job(job: dict, db: AsyncSession):
+    """큐에서 꺼낸 작업으로 AI 피드백을 생성 후 저장하는 함수 (워커 전용)"""
+
+    resume = await get_resume_response(resume_id=job["resume_id"], db=db)
+
+    if resume is None or resume.get("user_id") != job["user_id"]:
+        raise ValueError("존재하지 않는 이력서 입니다.")
+
+    resume_dict = ResumeResponse.model_validate(resume).model_dump()
+
+    if job["posting_id"] is None:
+        result = await resume_standard_feedback(
+            resume_dict,
+            refresh=job["refresh"],
+            user_id=job["user_id"],
+            priority=PRIORITY_BACKGROUND,
+        )
+
+    else:
+        posting = await db.get(JobPosting, job["posting_id"])
+
+        if posting is None or posting.user_id != job["user_id"]:
+            raise ValueError("존재하지 않는 공고입니다.")
+
+        posting = JobPostingResponse.from_orm(posting).model_dump()
+        result = await resume_feedback_with_posting(
+            resume=resume_dict,
+            posting=posting,
+            refresh=job["refresh"],
+            user_id=job["user_id"],
+            priority=PRIORITY_BACKGROUND,
+        )
+
+    feedback = await save_resume_feedback(
+        result=result,
+        db=db,
+        user_id=job["user_id"],
+        resume_id=job["resume_id"],
+        posting_id=job["posting_id"],
+    )
+
+    return feedback
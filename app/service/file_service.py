@@ -0,0 +1,251 @@
+import hashlib
+import io
+import logging
+from typing import List
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import settings
+from app.database import AsyncSessionLocal
+from app.models.models import File, StorageObject
+from app.storage_util.image_processing import (
+    IMAGE_DERIVATIVE_PURPOSES,
+    create_image_derivatives,
+)
+from app.storage_util.storage_util import (
+    delete_from_storage,
+    generate_presigned_urls,
+    upload_to_image,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def acquire_object(db: AsyncSession, file_key: str, existing_refs: int = 0) -> int:
+    """스토리지 객체의 참조를 하나 늘리고 늘어난 참조 수를 반환하는 함수
+
+    참조 카운트 행이 없는 기존 객체를 공유할 때는 existing_refs 로 이미 참조 중인 files 행 수를 넘긴다.
+    """
+
+    stmt = (
+        insert(StorageObject)
+        .values(file_key=file_key, ref_count=existing_refs + 1)
+        .on_conflict_do_update(
+            index_elements=[StorageObject.file_key],
+            set_={"ref_count": StorageObject.ref_count + 1},
+        )
+        .returning(StorageObject.ref_count)
+    )
+
+    result = await db.execute(stmt)
+
+    return result.scalar_one()
+
+
+async def release_object(db: AsyncSession, file_key: str) -> bool:
+    """스토리지 객체의 참조를 하나 줄이는 함수 - 마지막 참조였으면 True (호출 측에서 commit 후 purge_object)
+
+    참조가 0 이 된 행은 purge_object 가 스토리지 객체를 지울 때까지 남겨 둔다.
+    """
+
+    result = await db.execute(
+        update(StorageObject)
+        .where(StorageObject.file_key == file_key)
+        .values(ref_count=StorageObject.ref_count - 1)
+        .returning(StorageObject.ref_count)
+    )
+    remaining = result.scalar_one_or_none()
+
+    # 참조 카운트 도입 전 객체는 files 행 하나만 참조한다 - purge_object 가 잠글 행을 만들어 둔다
+    if remaining is None:
+        await db.execute(
+            insert(StorageObject)
+            .values(file_key=file_key, ref_count=0)
+            .on_conflict_do_nothing(index_elements=[StorageObject.file_key])
+        )
+        return True
+
+    return remaining <= 0
+
+
+async def purge_object(file_key: str) -> bool:
+    """참조가 0 인 객체를 스토리지에서 지우는 함수 - release_object 를 commit 한 뒤 호출
+
+    그 사이 같은 내용이 다시 올라왔을 수 있으므로 행을 잠근 채 참조 수를 다시 확인한다.
+    잠금 중에 들어온 acquire_object 는 삭제가 끝날 때까지 기다렸다가 새로 업로드한다.
+    요청 세션과 분리된 자체 세션을 쓰므로 실패해도 이미 commit 된 요청 결과에는 영향이 없다.
+    """
+
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(StorageObject.ref_count)
+                .where(StorageObject.file_key == file_key)
+                .with_for_update()
+            )
+            ref_count = result.scalar_one_or_none()
+
+            if ref_count is not None and ref_count > 0:
+                await db.rollback()
+                return False
+
+            await delete_from_storage(file_key)
+
+            await db.execute(
+                delete(StorageObject).where(
+                    and_(StorageObject.file_key == file_key, StorageObject.ref_count <= 0)
+                )
+            )
+            await db.commit()
+
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"storage purge error: {file_key}: {e}")
+            return False
+
+    return True
+
+
+async def purge_objects(file_keys: List[str]):
+    """release_objects 가 돌려준 key 들을 차례로 purge_object - 응답 후 BackgroundTasks 로 실행"""
+
+    for file_key in file_keys:
+        await purge_object(file_key)
+
+
+async def store_image(db: AsyncSession, file: dict) -> dict:
+    """검증된 이미지를 내용의 sha256 으로 만든 key 에 저장하는 함수 - 같은 내용이 이미 있으면 업로드 생략"""
+
+    content_hash = file["content_hash"]
+    unique_filename = f"{content_hash}.{file.get('real_format').lower()}"
+
+    file_key = f"{settings.image}/{unique_filename}"
+
+    # 처음 참조될 때만 업로드 - 동시에 같은 key 를 잡으면 ON CONFLICT 가 행 잠금으로 직렬화한다
+    if await acquire_object(db=db, file_key=file_key) == 1:
+        await upload_to_image(file=file, unique_filename=unique_filename)
+
+    return {
+        "unique_filename": unique_filename,
+        "temp_key": file_key,
+        "content_hash": content_hash,
+    }
+
+
+async def share_image(db: AsyncSession, image_file: File, **values) -> File:
+    """기존 이미지 객체를 복사하지 않고 참조만 늘려 새 files 행을 만드는 함수"""
+
+    await acquire_object(db=db, file_key=image_file.file_key, existing_refs=1)
+
+    new_file = File(
+        filetype=image_file.filetype,
+        org_file_name=image_file.org_file_name,
+        mod_file_name=image_file.mod_file_name,
+        file_key=image_file.file_key,
+        content_hash=image_file.content_hash,
+        purpose=image_file.purpose,
+        **values,
+    )
+    db.add(new_file)
+
+    return new_file
+
+
+async def store_image_derivatives(
+    db: AsyncSession, file: dict, resume_id: int, user_id: int
+):
+    """EXIF 를 제거한 WebP 본문과 썸네일을 만들어 purpose 별 files 행으로 저장하는 함수
+
+    파생본 생성에 실패해도 원본 업로드는 유지한다.
+    """
+
+    try:
+        derivatives = await create_image_derivatives(file["fileobj"])
+
+    except Exception as e:
+        logger.warning(f"image derivative error: {e}")
+        return
+
+    for purpose, data in derivatives.items():
+        stored = await store_image(
+            db=db,
+            file={
+                "real_format": "webp",
+                "fileobj": io.BytesIO(data),
+                "content_hash": hashlib.sha256(data).hexdigest(),
+            },
+        )
+
+        db.add(
+            File(
+                fileable_id=resume_id,
+                user_id=user_id,
+                filetype="webp",
+                fileable_table="resumes",
+                org_file_name=file.get("filename"),
+                mod_file_name=stored.get("unique_filename"),
+                file_key=stored.get("temp_key"),
+                content_hash=stored.get("content_hash"),
+                purpose=purpose,
+            )
+        )
+
+
+async def remove_image_derivatives(db: AsyncSession, resume_id: int) -> List[str]:
+    """이력서의 파생본 files 행을 지우고 참조하던 key 목록을 반환하는 함수
+
+    새 파생본을 store_image 로 먼저 잡은 뒤 release_objects 로 참조를 놓아야
+    내용이 같은 파생본이 삭제되지 않는다.
+    """
+
+    result = await db.execute(
+        delete(File)
+        .where(
+            and_(
+                File.fileable_id == resume_id,
+                File.purpose.in_(IMAGE_DERIVATIVE_PURPOSES),
+            )
+        )
+        .returning(File.file_key)
+    )
+
+    return result.scalars().all()
+
+
+async def release_objects(db: AsyncSession, file_keys: List[str]) -> List[str]:
+    """여러 key 의 참조를 놓고, 마지막 참조였던 key 목록을 반환하는 함수"""
+
+    return [
+        file_key
+        for file_key in file_keys
+        if await release_object(db=db, file_key=file_key)
+    ]
+
+
+async def get_resume_images(db: AsyncSession, resume_id: int) -> List[File]:
+    """이력서 원본 사진과 파생본 files 행 조회"""
+
+    result = await db.execute(
+        select(File).where(
+            and_(
+                File.fileable_id == resume_id,
+                File.purpose.in_(("resume_image", *IMAGE_DERIVATIVE_PURPOSES)),
+            )
+        )
+    )
+
+    return result.scalars().all()
+
+
+async def attach_image_urls(resume_info: dict) -> dict:
+    """image_url/thumbnail_url 을 채우는 함수 - 정규화된 WebP 본문이 있으면 원본 대신 사용"""
+
+    image_key = resume_info.get("webp_image_key") or resume_info.get("image_key")
+    thumbnail_key = resume_info.get("thumbnail_key")
+
+    urls = await generate_presigned_urls([image_key, thumbnail_key])
+
+    resume_info["image_url"] = urls.get(image_key)
+    resume_info["thumbnail_url"] = urls.get(thumbnail_key)
+
+    return resume_info
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import time
+from typing import Optional, Type
+from pydantic import BaseModel
+from app.config.settings import settings
+from app.redis_client.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "llm_cache"
+CACHE_INDEX_KEY = f"{CACHE_PREFIX}:index"
+CACHE_HITS_KEY = f"{CACHE_PREFIX}:hits"
+CACHE_MISSES_KEY = f"{CACHE_PREFIX}:misses"
+
+# 내용과 무관하게 매번 바뀌는 필드 (presigned url 등)는 키에서 제외
+VOLATILE_FIELDS = {"image_url", "thumbnail_url", "portfolio_url"}
+
+
+def normalize(value):
+    """캐시 키 생성을 위해 값에서 휘발성 필드를 제거하는 함수"""
+
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+
+    if isinstance(value, dict):
+        return {
+            k: normalize(v) for k, v in value.items() if k not in VOLATILE_FIELDS
+        }
+
+    if isinstance(value, list):
+        return [normalize(v) for v in value]
+
+    return value
+
+
+def make_cache_key(fingerprint: dict) -> str:
+    """이력서/공고/프롬프트 버전/provider·모델 설정으로 안정적인 캐시 키를 만드는 함수"""
+
+    payload = {
+        **normalize(fingerprint),
+        # 같은 모델 이름이라도 provider(fake/로컬 서버)가 다르면 결과를 공유하지 않는다
+        "llm_provider": settings.llm_provider,
+        "llm_base_url": settings.llm_base_url,
+        "ai_model": settings.ai_model,
+        "temperature": settings.temperature,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+
+    return f"{CACHE_PREFIX}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+
+async def get_cached_result(key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+    """캐시된 결과를 조회하고 hit/miss 카운터를 올리는 함수"""
+
+    try:
+        cached = await redis_client.get(key)
+        await redis_client.incr(CACHE_HITS_KEY if cached else CACHE_MISSES_KEY)
+
+    except Exception as e:
+        logger.warning(f"llm cache get error: {e}")
+        return None
+
+    if cached is None:
+        return None
+
+    return schema.model_validate_json(cached)
+
+
+async def set_cached_result(key: str, result: BaseModel):
+    """결과를 TTL과 함께 저장하고, 최대 개수를 넘으면 오래된 항목부터 제거하는 함수"""
+
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(key, result.model_dump_json(), ex=settings.ai_cache_ttl)
+            pipe.zadd(CACHE_INDEX_KEY, {key: time.time()})
+            pipe.zremrangebyscore(CACHE_INDEX_KEY, 0, time.time() - settings.ai_cache_ttl)
+            pipe.zcard(CACHE_INDEX_KEY)
+            *_, size = await pipe.execute()
+
+        overflow = size - settings.ai_cache_max_entries
+        if overflow > 0:
+            evicted = await redis_client.zpopmin(CACHE_INDEX_KEY, overflow)
+            await redis_client.delete(*[k for k, _ in evicted])
+
+    except Exception as e:
+        logger.warning(f"llm cache set error: {e}")
+
+
+async def get_cache_stats() -> dict:
+    """캐시 hit/miss 카운터와 현재 항목 수를 반환하는 함수"""
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(CACHE_HITS_KEY)
+        pipe.get(CACHE_MISSES_KEY)
+        pipe.zcard(CACHE_INDEX_KEY)
+        hits, misses, entries = await pipe.execute()
+
+    return {"hits": int(hits or 0), "misses": int(misses or 0), "entries": entries}
@@ -0,0 +1,279 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from uuid import uuid4
+from fastapi import HTTPException, status
+from app.config.settings import settings
+from app.redis_client.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+LIMIT_PREFIX = "llm_limit"
+INFLIGHT_KEY = f"{LIMIT_PREFIX}:inflight"
+RPM_BUCKET_KEY = f"{LIMIT_PREFIX}:rpm"
+TPM_BUCKET_KEY = f"{LIMIT_PREFIX}:tpm"
+
+# 사용자 요청은 예약 슬롯까지 쓰고, 워커 작업은 예약 슬롯을 비워두고 더 오래 기다린다
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+
+# 동시 실행 한도로 막혔을 때 (남은 시간을 알 수 없음)
+SLOT_BUSY = -1
+
+# 워커 전체에서 동시 실행 수와 RPM/TPM 토큰 버킷을 원자적으로 확인 후 차감하는 스크립트
+# 반환값: 0 = 허가, SLOT_BUSY = 동시 실행 한도, 양수 = 버킷이 찰 때까지 기다려야 하는 ms
+ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local lease_ttl = tonumber(ARGV[2])
+local max_inflight = tonumber(ARGV[3])
+local user_max = tonumber(ARGV[4])
+local rpm = tonumber(ARGV[5])
+local tpm = tonumber(ARGV[6])
+local need = math.min(tonumber(ARGV[7]), tpm)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= max_inflight then
+    return -1
+end
+
+if user_max > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+    if redis.call('ZCARD', KEYS[2]) >= user_max then
+        return -1
+    end
+end
+
+local function level(key, capacity)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    return math.min(capacity, tokens + (now - ts) * capacity / 60000)
+end
+
+local requests = level(KEYS[3], rpm)
+local budget = level(KEYS[4], tpm)
+
+local wait = 0
+if requests < 1 then
+    wait = math.max(wait, (1 - requests) * 60000 / rpm)
+end
+if budget < need then
+    wait = math.max(wait, (need - budget) * 60000 / tpm)
+end
+if wait > 0 then
+    return math.ceil(wait)
+end
+
+redis.call('HSET', KEYS[3], 'tokens', requests - 1, 'ts', now)
+redis.call('HSET', KEYS[4], 'tokens', budget - need, 'ts', now)
+redis.call('PEXPIRE', KEYS[3], 60000)
+redis.call('PEXPIRE', KEYS[4], 60000)
+
+redis.call('ZADD', KEYS[1], now + lease_ttl, ARGV[1])
+redis.call('PEXPIRE', KEYS[1], lease_ttl)
+if user_max > 0 then
+    redis.call('ZADD', KEYS[2], now + lease_ttl, ARGV[1])
+    redis.call('PEXPIRE', KEYS[2], lease_ttl)
+end
+
+return 0
+"""
+
+_acquire_script = redis_client.register_script(ACQUIRE_SCRIPT)
+_local_slots: Optional[asyncio.Semaphore] = None
+
+
+def llm_call_timeout() -> float:
+    """호출 하나의 전체 제한 시간 - 시도마다 ai_timeout 이 걸리므로 재시도 횟수만큼 늘린다"""
+
+    return settings.ai_timeout * (settings.ai_max_retries + 1)
+
+
+def _user_key(user_id: Optional[int]) -> str:
+    return f"{INFLIGHT_KEY}:user:{user_id}"
+
+
+def _get_local_slots() -> asyncio.Semaphore:
+    """프로세스 안의 동시 호출 수 제한 - Redis 장애 시에도 이 한도는 유지된다"""
+
+    global _local_slots
+
+    if _local_slots is None:
+        _local_slots = asyncio.Semaphore(settings.llm_process_concurrency)
+
+    return _local_slots
+
+
+def estimate_tokens(inputs: dict) -> int:
+    """프롬프트 입력 길이로 호출 하나가 쓸 토큰 수(입력 + 출력)를 어림하는 함수"""
+
+    raw = json.dumps(inputs, ensure_ascii=False, default=str)
+
+    return len(raw) // settings.llm_chars_per_token + settings.llm_output_tokens
+
+
+def _too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="AI 요청이 많습니다. 잠시 후 다시 시도해 주세요.",
+        headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+    )
+
+
+async def _try_acquire(
+    lease_id: str, user_id: Optional[int], tokens: int, priority: str
+) -> int:
+    max_inflight = settings.llm_max_concurrency
+
+    if priority == PRIORITY_BACKGROUND:
+        max_inflight = max(max_inflight - settings.llm_interactive_reserved, 1)
+
+    return await _acquire_script(
+        keys=[INFLIGHT_KEY, _user_key(user_id), RPM_BUCKET_KEY, TPM_BUCKET_KEY],
+        args=[
+            lease_id,
+            (llm_call_timeout() + settings.llm_lease_margin) * 1000,
+            max_inflight,
+            settings.llm_user_max_concurrency if user_id is not None else 0,
+            settings.llm_rpm,
+            settings.llm_tpm,
+            tokens,
+        ],
+    )
+
+
+def _deadline(priority: str) -> float:
+    return time.monotonic() + (
+        settings.llm_background_queue_deadline
+        if priority == PRIORITY_BACKGROUND
+        else settings.llm_queue_deadline
+    )
+
+
+async def acquire_llm_lease(
+    user_id: Optional[int],
+    tokens: int,
+    priority: str = PRIORITY_INTERACTIVE,
+    deadline: Optional[float] = None,
+) -> Optional[str]:
+    """워커 전체 한도(동시 실행, RPM/TPM, 사용자별 동시 실행) 안에서 lease 를 얻는 함수
+
+    마감 안에 얻을 수 없으면 기다리지 않고 Retry-After 를 담은 429 를 던진다.
+    lease 는 만료 시각이 있어 반납하지 못해도 잠시 뒤 풀리며,
+    Redis 를 쓸 수 없으면 None 을 반환한다 (프로세스 한도만 적용).
+    """
+
+    deadline = deadline or _deadline(priority)
+    lease_id = uuid4().hex
+
+    while True:
+        try:
+            wait_ms = await _try_acquire(lease_id, user_id, tokens, priority)
+
+        except Exception as e:
+            logger.warning(f"llm limit acquire error: {e}")
+            return None
+
+        if wait_ms == 0:
+            return lease_id
+
+        remaining = deadline - time.monotonic()
+
+        # 버킷이 찰 때까지 남은 시간을 알면 기다려도 소용없는 요청은 바로 돌려보낸다
+        if wait_ms != SLOT_BUSY and wait_ms / 1000 > remaining:
+            raise _too_many_requests(wait_ms / 1000)
+
+        if remaining <= 0:
+            raise _too_many_requests(settings.llm_queue_poll_interval)
+
+        # 여러 워커가 같은 순간에 다시 시도하지 않도록 흩어서 대기
+        delay = settings.llm_queue_poll_interval if wait_ms == SLOT_BUSY else wait_ms / 1000
+        await asyncio.sleep(
+            min(delay + random.uniform(0, settings.llm_queue_poll_interval), remaining)
+        )
+
+
+async def release_llm_lease(lease_id: Optional[str], user_id: Optional[int]):
+    """lease 반납 - RPM/TPM 사용량은 돌려주지 않는다"""
+
+    if lease_id is None:
+        return
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zrem(INFLIGHT_KEY, lease_id)
+            pipe.zrem(_user_key(user_id), lease_id)
+            await pipe.execute()
+
+    except Exception as e:
+        logger.warning(f"llm limit release error: {e}")
+
+
+async def acquire_local_slot(deadline: float):
+    """프로세스 안의 동시 호출 슬롯을 얻는 함수 - 마감까지 얻지 못하면 429"""
+
+    try:
+        await asyncio.wait_for(
+            _get_local_slots().acquire(), timeout=max(deadline - time.monotonic(), 0)
+        )
+
+    except asyncio.TimeoutError:
+        raise _too_many_requests(settings.llm_queue_poll_interval)
+
+
+def release_local_slot():
+    _get_local_slots().release()
+
+
+async def acquire_llm_slot(
+    user_id: Optional[int],
+    tokens: int,
+    priority: str = PRIORITY_INTERACTIVE,
+) -> Optional[str]:
+    """프로세스 슬롯을 먼저 잡고 워커 전체 lease 를 얻는 함수 - 반납은 release_llm_slot
+
+    프로세스 슬롯을 기다리는 동안 워커 전체 한도를 차지하지 않도록 이 순서로 얻는다.
+    """
+
+    deadline = _deadline(priority)
+
+    await acquire_local_slot(deadline)
+
+    try:
+        return await acquire_llm_lease(
+            user_id=user_id, tokens=tokens, priority=priority, deadline=deadline
+        )
+
+    except BaseException:
+        release_local_slot()
+        raise
+
+
+async def release_llm_slot(lease_id: Optional[str], user_id: Optional[int]):
+    """acquire_llm_slot 으로 얻은 프로세스 슬롯과 lease 를 반납하는 함수"""
+
+    release_local_slot()
+    await release_llm_lease(lease_id, user_id)
+
+
+@asynccontextmanager
+async def llm_slot(
+    user_id: Optional[int],
+    tokens: int,
+    priority: str = PRIORITY_INTERACTIVE,
+):
+    """LLM 호출 하나를 감싸는 슬롯 - 블록이 끝나면 반납"""
+
+    lease_id = await acquire_llm_slot(user_id=user_id, tokens=tokens, priority=priority)
+
+    try:
+        yield
+
+    finally:
+        await release_llm_slot(lease_id, user_id)
@@ -1,39 +1,28 @@
 import secrets
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import and_, case, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, datetime
-from app.models.models import Code, User
-from sqlalchemy.orm import aliased
+from app.models.models import User
+from app.service.code_service import get_code_detail
 
 
 async def get_user_by_id(db: AsyncSession, user_id: str):
-    GenderCode = aliased(Code)
-    UsertypeCode = aliased(Code)
 
-    stmt = (
-        select(
-            User,
-            GenderCode.code_detail.label("gender_detail"),
-            UsertypeCode.code_detail.label("user_type_detail"),
-        )
-        .outerjoin(
-            GenderCode,
-            (GenderCode.division == "gender") & (GenderCode.detail_id == User.gender),
-        )
-        .outerjoin(
-            UsertypeCode,
-            (UsertypeCode.division == "user_type")
-            & (UsertypeCode.detail_id == User.user_type),
-        )
-        .where(User.unique_id == user_id, User.is_active == True)
-    )
+    stmt = select(User).where(User.unique_id == user_id, User.is_active == True)
 
     user = await db.execute(stmt)
 
-    user = user.first()
+    user = user.scalar_one_or_none()
 
-    return user
+    if user is None:
+        return None
+
+    return (
+        user,
+        get_code_detail("gender", user.gender),
+        get_code_detail("user_type", user.user_type),
+    )
 
 
 async def get_user_by_email(db: AsyncSession, email: str):
@@ -60,6 +49,25 @@ async def get_user_by_provider(db: AsyncSession, provieder: str, provider_id: st
     return user
 
 
+async def resolve_oauth_user(
+    db: AsyncSession, provider: str, provider_id: str, email: str
+) -> Optional[User]:
+    """(provider, provider_id) 또는 email 로 사용자를 한 번의 조회로 찾는 함수 - provider 일치를 우선"""
+
+    provider_match = and_(User.provider == provider, User.provider_id == provider_id)
+
+    stmt = (
+        select(User)
+        .where(or_(provider_match, User.email == email))
+        .order_by(case((provider_match, 0), else_=1))
+        .limit(1)
+    )
+
+    result = await db.execute(stmt)
+
+    return result.scalar_one_or_none()
+
+
 def generate_unique_user_id():
     return secrets.token_urlsafe(16)
 
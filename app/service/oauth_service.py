@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+import httpx
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import settings
+from app.security import create_access_token
+from app.service.activity_service import ACTION_LOGIN, record_activity
+from app.service.login_service import resolve_oauth_user
+from app.service.user_cache_service import cache_user
+
+
+async def exchange_google_code(
+    client: httpx.AsyncClient, code: str, redirect_uri: str
+) -> dict:
+    """구글 인가 코드를 토큰으로 교환하고 사용자 정보를 가져오는 함수"""
+
+    token_response = await client.post(
+        settings.google_oauth_token_url,
+        data={
+            "code": code,
+            "client_id": settings.google_client_id,
+            "client_secret": settings.google_client_secret,
+            "redirect_uri": redirect_uri,
+            "grant_type": "authorization_code",
+        },
+    )
+
+    if token_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"토큰 교환 실패: {token_response.text}",
+        )
+
+    access_token = token_response.json().get("access_token")
+
+    user_info_response = await client.get(
+        settings.google_oauth_userinfo_url,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+    if user_info_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"사용자 정보 불러오기 실패: {user_info_response.text}",
+        )
+
+    return user_info_response.json()
+
+
+async def oauth_login(db: AsyncSession, provider: str, user_info: dict) -> dict:
+    """OAuth 사용자 정보로 로그인 응답을 만드는 함수 - 조회 1회"""
+
+    user = await resolve_oauth_user(
+        db, provider=provider, provider_id=user_info["id"], email=user_info["email"]
+    )
+
+    if user is None:
+        return {
+            "is_new_user": True,
+            "user": {
+                "provider": provider,
+                "provider_id": user_info["id"],
+                "email": user_info["email"],
+                "name": user_info["name"],
+            },
+            "is_active": True,
+        }
+
+    if user.is_active == False:
+        return {
+            "is_new_user": False,
+            "user": {"user_id": user.user_id},
+            "is_active": False,
+        }
+
+    jwt_token = create_access_token(data={"sub": user.unique_id})
+
+    # last_accessed 와 로그인 로그는 버퍼에 쌓고 백그라운드에서 기록
+    record_activity(user.user_id, ACTION_LOGIN)
+
+    # 방금 조회한 사용자로 캐시를 갱신 - DB 기록을 기다리지 않고 새 last_accessed 를 반영
+    await cache_user(user, last_accessed=datetime.now(timezone.utc))
+
+    return {
+        "access_token": jwt_token,
+        "token_type": "bearer",
+        "user": {"name": user.name, "email": user.email},
+        "is_new_user": False,
+        "is_active": True,
+    }
@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """(created_at, id)를 불투명한 커서 토큰으로 변환"""
+
+    raw = json.dumps([created_at.isoformat(), row_id])
+
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 토큰을 (created_at, id)로 복원"""
+
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다."
+        )
+
+
+def keyset_condition(created_at_column, id_column, cursor: str):
+    """ORDER BY created_at DESC, id DESC 기준으로 커서 다음 행만 남기는 조건"""
+
+    created_at, row_id = decode_cursor(cursor)
+
+    return tuple_(created_at_column, id_column) < tuple_(created_at, row_id)
+
+
+def split_page(
+    rows: List[Any], page_size: int, created_at_attr: str, id_attr: str
+) -> Tuple[List[Any], Optional[str]]:
+    """page_size + 1개 조회한 결과를 (현재 페이지, 다음 커서)로 나누는 함수"""
+
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+
+    return rows, encode_cursor(getattr(last, created_at_attr), getattr(last, id_attr))
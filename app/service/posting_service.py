@@ -1,9 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import desc, select, update, delete
-from typing import Optional, List
+from sqlalchemy import desc, func, or_, select, update, delete
+from typing import Optional, List, Tuple
 
 from app.models.models import JobPosting as DBJobPosting
 from app.schema.schemas import JobPostingCreate, JobPostingUpdate
+from app.service.dashboard_service import invalidate_dashboard, record_stat
+from app.service.pagination_service import keyset_condition, split_page
+from app.service.search_service import like_pattern, normalize_search_term
 
 
 async def create_job_posting(
@@ -16,8 +19,10 @@ async def create_job_posting(
     )
 
     db.add(db_job)
+    await record_stat(db=db, user_id=user_id, metric="job_postings")
     await db.commit()
     await db.refresh(db_job)
+    await invalidate_dashboard(user_id)
 
     return db_job
 
@@ -28,30 +33,61 @@ async def get_job_postings(
     page_size: int = 6,
     page: int = 1,
     title: Optional[str] = None,
-) -> List[DBJobPosting]:
-    """모든 채용 공고 목록을 조회합니다."""
+    cursor: Optional[str] = None,
+) -> Tuple[List[DBJobPosting], Optional[str]]:
+    """모든 채용 공고 목록을 조회합니다. (공고 목록, 다음 커서)를 반환하며 커서는 cursor 모드에서만 채워집니다."""
+
+    title = normalize_search_term(title)
+
+    search_condition = [DBJobPosting.user_id == user_id, DBJobPosting.is_active == True]
+    order_by = [desc(DBJobPosting.created_at), desc(DBJobPosting.posting_id)]
+
+    if title:
+        # 제목/회사명 부분 일치 (pg_trgm GIN 인덱스 사용)
+        pattern = like_pattern(title)
+        search_condition.append(
+            or_(
+                DBJobPosting.title.ilike(pattern, escape="\\"),
+                DBJobPosting.company.ilike(pattern, escape="\\"),
+            )
+        )
 
-    offset = (page - 1) * page_size
+    if cursor is not None:
+        # 커서 모드: 최신순 keyset 페이지네이션
+        if cursor:
+            search_condition.append(
+                keyset_condition(DBJobPosting.created_at, DBJobPosting.posting_id, cursor)
+            )
+
+        result = await db.execute(
+            select(DBJobPosting)
+            .where(*search_condition)
+            .order_by(*order_by)
+            .limit(page_size + 1)
+        )
 
-    title = title.strip() if title else None
+        return split_page(result.scalars().all(), page_size, "created_at", "posting_id")
+
+    if title:
+        # 페이지 모드 검색은 유사도 순 정렬
+        order_by.insert(
+            0,
+            desc(
+                func.greatest(
+                    func.similarity(DBJobPosting.title, title),
+                    func.similarity(DBJobPosting.company, title),
+                )
+            ),
+        )
 
-    search_condition = (
-        [
-            DBJobPosting.title.ilike(f"%{title}%"),
-            DBJobPosting.user_id == user_id,
-            DBJobPosting.is_active == True,
-        ]
-        if title
-        else [DBJobPosting.user_id == user_id, DBJobPosting.is_active == True]
-    )
     result = await db.execute(
         select(DBJobPosting)
         .where(*search_condition)
-        .order_by(desc(DBJobPosting.created_at))
-        .offset(offset)
+        .order_by(*order_by)
+        .offset((page - 1) * page_size)
         .limit(page_size)
     )
-    return result.scalars().all()
+    return result.scalars().all(), None
 
 
 async def get_job_posting(db: AsyncSession, posting_id: int) -> Optional[DBJobPosting]:
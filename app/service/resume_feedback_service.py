@@ -1,23 +1,13 @@
-from typing import Optional
+import asyncio
+import time
+from typing import AsyncIterator, Optional, Union
 from fastapi import HTTPException, status
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from sqlalchemy import and_, select
+from sqlalchemy import select
 from app.config.settings import settings
-from app.models.models import (
-    Activity,
-    Education,
-    Experience,
-    File,
-    JobPosting,
-    Project,
-    Qualification,
-    Resume,
-    ResumeFeedback,
-    Code,
-    TechnologyStack,
-)
+from app.llm_client.llm_client import get_llm
+from app.models.models import JobPosting, ResumeFeedback, FeedbackContent
 from app.schema.schemas import (
     FeedbackContentAI,
     ResumeCreate,
@@ -28,74 +18,321 @@ from app.schema.schemas import (
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import contains_eager, joinedload
 
-from app.service.resume_service import get_resume_response
-from app.storage_util.storage_util import (
-    copy_image,
-    generate_presigned_url,
-    generate_unique_filename,
+from app.service.code_service import get_code_detail
+from app.service.llm_cache_service import (
+    get_cached_result,
+    make_cache_key,
+    set_cached_result,
+)
+from app.service.llm_limit_service import (
+    PRIORITY_INTERACTIVE,
+    acquire_llm_slot,
+    estimate_tokens,
+    llm_call_timeout,
+    llm_slot,
+    release_llm_slot,
+)
+from app.service.resume_service import get_resume_response, insert_resume
+from app.service.activity_service import (
+    ACTION_FEEDBACK_CREATE,
+    ACTION_RESUME_CREATE,
+    record_activity,
 )
+from app.service.dashboard_service import invalidate_dashboard, record_stat
+from app.service.file_service import attach_image_urls, get_resume_images, share_image
 
 
-llm = ChatOpenAI(
-    api_key=settings.openai_api_key,
-    model=settings.ai_model,
-    temperature=settings.temperature,
-)
+def _feedback_stream_schema() -> dict:
+    """스트리밍용 ResumeFeedbackAI 스키마 - 피드백 리스트를 가장 먼저 생성하도록 필드 순서 변경"""
 
+    schema = ResumeFeedbackAI.model_json_schema()
+    properties = schema["properties"]
+    schema["properties"] = {
+        "feedback_contents": properties["feedback_contents"],
+        **{k: v for k, v in properties.items() if k != "feedback_contents"},
+    }
 
-async def resume_standard_feedback(resume: dict) -> ResumeFeedbackAI:
-    """일반 이력서 첨삭"""
+    return schema
+
+
+FEEDBACK_STREAM_SCHEMA = _feedback_stream_schema()
+
+
+async def run_chain(
+    chain,
+    inputs: dict,
+    user_id: Optional[int] = None,
+    priority: str = PRIORITY_INTERACTIVE,
+):
+    """체인을 비동기로 실행하는 함수 - 동시 호출/RPM/TPM 한도 안에서 호출별 타임아웃 적용
+
+    ai_timeout 은 시도 한 번의 제한이고, 재시도를 포함한 전체 시간이 지나면 504 를 던진다.
+    """
 
-    prompt = ChatPromptTemplate(
-        [
-            (
-                "system",
-                """당신은 전직 한 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서 정보를 받고 회사에 취업할 수 있도록 이력서를 피드백 해주세요, 
+    try:
+        async with llm_slot(
+            user_id=user_id, tokens=estimate_tokens(inputs), priority=priority
+        ):
+            return await asyncio.wait_for(
+                chain.ainvoke(inputs), timeout=llm_call_timeout()
+            )
+
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="AI 응답 시간이 초과되었습니다.",
+        )
+
+
+# 프롬프트 내용을 바꾸면 버전을 올려 기존 캐시를 무효화
+PROMPT_VERSION = "1"
+
+
+STANDARD_FEEDBACK_PROMPT = ChatPromptTemplate(
+    [
+        (
+            "system",
+            """당신은 전직 한 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서 정보를 받고 회사에 취업할 수 있도록 이력서를 피드백 해주세요, 
                 단 사실에 근거해야 합니다. 
                 매칭률은 0으로 출력하시오.
                 parent_content는 이력서의 내용을 입력받은 이력서의 내용을 마크다운 형식의 text로 빠지는 부분 없이 매우 구체적으로 정리하세요.
                 특히 기술스택, 경력, 학력, 자격, 프로젝트, 활동 의 내용을 빠지지 않게 작성하세요.
                 피드백 내용은 구체적으로 적어주세요
                 feedback_devision은 반드시 다음을 준수하세요 1:잘된 부분, 2:필수 수정 사항,3:개선 제안 사항, 4: 추가 권장사항""",
-            ),
-            ("user", "{resume}"),
-        ]
-    )
-
-    chain = prompt | llm.with_structured_output(ResumeFeedbackAI)
-
-    result = chain.invoke({"resume": resume})
-
-    return result
-
+        ),
+        ("user", "{resume}"),
+    ]
+)
 
-async def resume_feedback_with_posting(resume: dict, posting: dict) -> ResumeFeedbackAI:
-    """공고별 이력서 첨삭"""
 
-    prompt = ChatPromptTemplate(
-        [
-            (
-                "system",
-                """당신은 전직 {company} 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서와 공고 정보를 받고 해당 회사에 취업할 수 있도록 이력서를 피드백 해주세요,
+POSTING_FEEDBACK_PROMPT = ChatPromptTemplate(
+    [
+        (
+            "system",
+            """당신은 전직 {company} 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서와 공고 정보를 받고 해당 회사에 취업할 수 있도록 이력서를 피드백 해주세요,
          단 사실에 근거해야 합니다.
          parent_content는 입력받은 이력서의 내용을 마크다운 형식의 text로 빠지는 부분 없이 매우 구체적으로 정리하세요.
          특히 기술스택, 경력, 학력, 자격, 프로젝트, 활동 의 내용을 빠지지 않게 작성하세요
          피드백 내용은 구체적으로 적어주세요,
          feedback_devision은 반드시 다음을 준수하세요 1:잘된 부분, 2:필수 수정 사항,3:개선 제안 사항, 4: 추가 권장사항""",
-            ),
-            ("user", "{resume}, {posting}"),
-        ]
+        ),
+        ("user", "{resume}, {posting}"),
+    ]
+)
+
+
+STANDARD_RESUME_PROMPT = ChatPromptTemplate(
+    [
+        (
+            "system",
+            "당신은 전직 한 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서와 피드백 정보를 받고 피드백내용에 기반하여 이력서를 수정해 주세요,특히 자기소개서 부분을 이력서에 가장 잘 어울리게 첨삭 해주세요. , 단 사실에 근거해야 합니다.resume_type은 문자열'3'으로 적용시키세요,",
+        ),
+        ("user", "{resume},{feedback}"),
+    ]
+)
+
+
+POSTING_RESUME_PROMPT = ChatPromptTemplate(
+    [
+        (
+            "system",
+            "당신은 전직 {company} 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서와 피드백 정보, 공고 정보를 받고 피드백내용에 기반하여 이력서를 수정해 주세요, 특히 자기소개서 부분을 이력서에 가장 잘 어울리게 첨삭 해주세요. , 단 사실에 근거해야 합니다.resume_type은 문자열'2'로 적용시키세요",
+        ),
+        ("user", "{resume},{feedback}, {posting}"),
+    ]
+)
+
+
+async def run_cached_chain(
+    chain,
+    inputs: dict,
+    schema,
+    fingerprint: dict,
+    refresh: bool = False,
+    user_id: Optional[int] = None,
+    priority: str = PRIORITY_INTERACTIVE,
+):
+    """캐시를 먼저 조회하고, 없거나 refresh면 체인을 실행 후 결과를 캐시에 저장하는 함수"""
+
+    key = make_cache_key(fingerprint)
+
+    if not refresh:
+        cached = await get_cached_result(key, schema)
+        if cached is not None:
+            return cached
+
+    result = await run_chain(chain, inputs, user_id=user_id, priority=priority)
+
+    await set_cached_result(key, result)
+
+    return result
+
+
+def feedback_fingerprint(resume: dict, posting: Optional[dict] = None) -> dict:
+    """첨삭 결과 캐시 키의 재료"""
+
+    return {
+        "prompt": "standard_feedback" if posting is None else "posting_feedback",
+        "prompt_version": PROMPT_VERSION,
+        "resume": resume,
+        "posting": posting,
+    }
+
+
+async def resume_standard_feedback(
+    resume: dict,
+    refresh: bool = False,
+    user_id: Optional[int] = None,
+    priority: str = PRIORITY_INTERACTIVE,
+) -> ResumeFeedbackAI:
+    """일반 이력서 첨삭"""
+
+    chain = STANDARD_FEEDBACK_PROMPT | get_llm().with_structured_output(ResumeFeedbackAI)
+
+    result = await run_cached_chain(
+        chain,
+        {"resume": resume},
+        ResumeFeedbackAI,
+        fingerprint=feedback_fingerprint(resume),
+        refresh=refresh,
+        user_id=user_id,
+        priority=priority,
     )
 
-    chain = prompt | llm.with_structured_output(ResumeFeedbackAI)
+    return result
 
-    result = chain.invoke(
-        {"company": posting.get("company"), "resume": resume, "posting": posting}
+
+async def resume_feedback_with_posting(
+    resume: dict,
+    posting: dict,
+    refresh: bool = False,
+    user_id: Optional[int] = None,
+    priority: str = PRIORITY_INTERACTIVE,
+) -> ResumeFeedbackAI:
+    """공고별 이력서 첨삭"""
+
+    chain = POSTING_FEEDBACK_PROMPT | get_llm().with_structured_output(ResumeFeedbackAI)
+
+    result = await run_cached_chain(
+        chain,
+        {"company": posting.get("company"), "resume": resume, "posting": posting},
+        ResumeFeedbackAI,
+        fingerprint=feedback_fingerprint(resume, posting),
+        refresh=refresh,
+        user_id=user_id,
+        priority=priority,
     )
 
     return result
 
 
+async def _stream_cached_feedback(
+    cached: ResumeFeedbackAI,
+) -> AsyncIterator[Union[FeedbackContentAI, ResumeFeedbackAI]]:
+    for content in cached.feedback_contents:
+        yield content
+    yield cached
+
+
+async def astream_with_deadline(chain, inputs: dict, timeout: float) -> AsyncIterator:
+    """chain.astream 전체에 마감 시간을 거는 제너레이터 - 넘기면 asyncio.TimeoutError
+
+    yield 를 감싸는 timeout 블록은 소비하는 쪽까지 취소하므로 청크마다 남은 시간만큼 기다린다.
+    """
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    stream = chain.astream(inputs).__aiter__()
+
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(
+                    stream.__anext__(), timeout=max(deadline - loop.time(), 0)
+                )
+
+            except StopAsyncIteration:
+                return
+
+            yield chunk
+
+    finally:
+        await stream.aclose()
+
+
+async def _stream_feedback_chain(
+    chain, inputs: dict, key: str, lease_id: Optional[str], user_id: Optional[int]
+) -> AsyncIterator[Union[FeedbackContentAI, ResumeFeedbackAI, None]]:
+    # lease 를 얻은 시각부터 ai_timeout 안에 끝내야 lease 가 스트림 도중 만료되지 않는다
+    deadline = time.monotonic() + settings.ai_timeout
+
+    try:
+        # 준비 신호 - 호출 측이 여기까지 진행시킨 뒤에는 aclose/GC 어느 경우에도 finally 가 실행된다
+        yield None
+
+        sent = 0
+        partial = {}
+
+        async for partial in astream_with_deadline(
+            chain, inputs, timeout=max(deadline - time.monotonic(), 0)
+        ):
+            contents = (partial or {}).get("feedback_contents") or []
+
+            # 마지막 항목은 아직 생성 중일 수 있으므로 그 앞 항목까지만 전송
+            while sent < len(contents) - 1:
+                yield FeedbackContentAI.model_validate(contents[sent])
+                sent += 1
+
+    finally:
+        await release_llm_slot(lease_id, user_id)
+
+    result = ResumeFeedbackAI.model_validate(partial)
+
+    await set_cached_result(key, result)
+
+    for content in result.feedback_contents[sent:]:
+        yield content
+
+    yield result
+
+
+async def stream_resume_feedback(
+    resume: dict,
+    posting: Optional[dict] = None,
+    refresh: bool = False,
+    user_id: Optional[int] = None,
+) -> AsyncIterator[Union[FeedbackContentAI, ResumeFeedbackAI]]:
+    """이력서 첨삭 스트리밍 - 파싱이 끝난 FeedbackContentAI를 순서대로 내보내고 마지막에 전체 ResumeFeedbackAI를 내보냄
+
+    캐시 조회와 호출 한도 확인은 응답을 시작하기 전에 끝내야 하므로 await 후 이터레이터를 받는다.
+    한도를 넘으면 스트림 대신 429 가 발생한다.
+    """
+
+    key = make_cache_key(feedback_fingerprint(resume, posting))
+
+    if not refresh:
+        cached = await get_cached_result(key, ResumeFeedbackAI)
+        if cached is not None:
+            return _stream_cached_feedback(cached)
+
+    if posting is None:
+        prompt = STANDARD_FEEDBACK_PROMPT
+        inputs = {"resume": resume}
+    else:
+        prompt = POSTING_FEEDBACK_PROMPT
+        inputs = {"company": posting.get("company"), "resume": resume, "posting": posting}
+
+    chain = prompt | get_llm().with_structured_output(FEEDBACK_STREAM_SCHEMA)
+
+    # 프로세스 슬롯 -> 워커 전체 lease 순서로 응답 시작 전에 얻어야 한도 초과를 429 로 돌려줄 수 있다
+    lease_id = await acquire_llm_slot(user_id=user_id, tokens=estimate_tokens(inputs))
+
+    stream = _stream_feedback_chain(chain, inputs, key, lease_id, user_id)
+    await stream.__anext__()
+
+    return stream
+
+
 async def get_resume_feedback(
     feedback_id: int, db: AsyncSession
 ) -> ResumeFeedbackResponse:
@@ -113,27 +350,9 @@ async def get_resume_feedback(
     if feedback is None:
         return None
 
-    feedback_divisions = [
-        content.feedback_devision
-        for content in feedback.feedback_contents
-        if content.feedback_devision
-    ]
-
-    feedback_code_map = {}
-    if feedback_divisions:
-        code_stmt = select(Code).where(
-            and_(
-                Code.division == "feedback_division",
-                Code.detail_id.in_(feedback_divisions),
-            )
-        )
-        code_result = await db.execute(code_stmt)
-        codes = code_result.scalars().all()
-        feedback_code_map = {code.detail_id: code.code_detail for code in codes}
-
     for content in feedback.feedback_contents:
-        content.feedback_devision_detail = feedback_code_map.get(
-            content.feedback_devision
+        content.feedback_devision_detail = get_code_detail(
+            "feedback_division", content.feedback_devision
         )
 
     result = ResumeFeedbackResponse.from_orm(feedback)
@@ -141,50 +360,98 @@ async def get_resume_feedback(
     return result
 
 
-async def create_resume_by_feedback(resume: dict, feedback: dict) -> ResumeCreate:
-    """일반 첨삭 이력서 생성"""
+async def save_resume_feedback(
+    result: ResumeFeedbackAI,
+    db: AsyncSession,
+    user_id: int,
+    resume_id: int,
+    posting_id: Optional[int] = None,
+) -> ResumeFeedbackResponse:
+    """AI 피드백 결과를 저장 후 출력하는 함수"""
 
-    prompt = ChatPromptTemplate(
-        [
-            (
-                "system",
-                "당신은 전직 한 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서와 피드백 정보를 받고 피드백내용에 기반하여 이력서를 수정해 주세요,특히 자기소개서 부분을 이력서에 가장 잘 어울리게 첨삭 해주세요. , 단 사실에 근거해야 합니다.resume_type은 문자열'3'으로 적용시키세요,",
-            ),
-            ("user", "{resume},{feedback}"),
-        ]
+    new_feedback = ResumeFeedback(
+        resume_id=resume_id,
+        posting_id=posting_id,
+        user_id=user_id,
+        parent_content=result.parent_content,
+        matching_rate=result.matching_rate,
     )
+    db.add(new_feedback)
+    await db.flush()
+    await db.refresh(new_feedback)
+
+    await record_stat(db=db, user_id=user_id, metric="feedbacks")
+
+    for content in result.feedback_contents:
+        new_feedback_content = FeedbackContent(
+            feedback_id=new_feedback.feedback_id,
+            feedback_devision=content.feedback_devision,
+            feedback_result=content.feedback_result,
+        )
+        db.add(new_feedback_content)
+
+    await db.commit()
+    await invalidate_dashboard(user_id)
+    record_activity(user_id, ACTION_FEEDBACK_CREATE)
+
+    feedback = await get_resume_feedback(db=db, feedback_id=new_feedback.feedback_id)
+
+    return feedback
 
-    chain = prompt | llm.with_structured_output(ResumeCreate)
 
-    result = chain.invoke({"resume": resume, "feedback": feedback})
+async def create_resume_by_feedback(
+    resume: dict, feedback: dict, refresh: bool = False, user_id: Optional[int] = None
+) -> ResumeCreate:
+    """일반 첨삭 이력서 생성"""
+
+    chain = STANDARD_RESUME_PROMPT | get_llm().with_structured_output(ResumeCreate)
+
+    result = await run_cached_chain(
+        chain,
+        {"resume": resume, "feedback": feedback},
+        ResumeCreate,
+        fingerprint={
+            "prompt": "standard_resume",
+            "prompt_version": PROMPT_VERSION,
+            "resume": resume,
+            "feedback": feedback,
+        },
+        refresh=refresh,
+        user_id=user_id,
+    )
 
     return result
 
 
 async def create_posting_resume_by_feedback(
-    resume: dict, feedback: dict, posting: dict
+    resume: dict,
+    feedback: dict,
+    posting: dict,
+    refresh: bool = False,
+    user_id: Optional[int] = None,
 ) -> ResumeCreate:
     """공고별 첨삭 이력서 생성"""
 
-    prompt = ChatPromptTemplate(
-        [
-            (
-                "system",
-                "당신은 전직 {company} 회사의 인사과 팀장이자 이력서 첨삭 전문가 입니다. 이력서와 피드백 정보, 공고 정보를 받고 피드백내용에 기반하여 이력서를 수정해 주세요, 특히 자기소개서 부분을 이력서에 가장 잘 어울리게 첨삭 해주세요. , 단 사실에 근거해야 합니다.resume_type은 문자열'2'로 적용시키세요",
-            ),
-            ("user", "{resume},{feedback}, {posting}"),
-        ]
-    )
-
-    chain = prompt | llm.with_structured_output(ResumeCreate)
+    chain = POSTING_RESUME_PROMPT | get_llm().with_structured_output(ResumeCreate)
 
-    result = chain.invoke(
+    result = await run_cached_chain(
+        chain,
         {
             "company": posting.get("company"),
             "resume": resume,
             "feedback": feedback,
             "posting": posting,
-        }
+        },
+        ResumeCreate,
+        fingerprint={
+            "prompt": "posting_resume",
+            "prompt_version": PROMPT_VERSION,
+            "resume": resume,
+            "feedback": feedback,
+            "posting": posting,
+        },
+        refresh=refresh,
+        user_id=user_id,
     )
 
     return result
@@ -200,97 +467,43 @@ async def create_resume_with_feedback(
 ) -> ResumeResponse:
     """피드백을 기반으로 생성된 이력서를 저장 후 출력하는 함수"""
 
-    new_resume = Resume(
+    resume_id = await insert_resume(
+        db=db,
+        data=result,
         user_id=user_id,
-        resume_type=result.resume_type,
         title=(
             f"[{result.title}][{company}] 첨삭 이력서"
             if company
             else f"[{result.title}] 첨삭 이력서"
         ),
-        name=result.name,
-        email=result.email,
-        gender=result.gender,
-        address=result.address,
-        phone=result.phone,
-        military_service=result.military_service,
-        birth_date=result.birth_date,
-        self_introduction=result.self_introduction,
         posting_id=posting_id if posting_id else None,
     )
-    db.add(new_resume)
-    await db.flush()
-    await db.refresh(new_resume)
+    await record_stat(db=db, user_id=user_id, metric="resumes")
 
-    for technology_stack in result.technology_stacks:
-        new_tech = TechnologyStack(
-            resume_id=new_resume.resume_id, title=technology_stack.title
-        )
-        db.add(new_tech)
+    image_files = await get_resume_images(db=db, resume_id=parent_resume_id)
 
-    for experience in result.experiences:
-        new_experience = Experience(
-            resume_id=new_resume.resume_id, **experience.model_dump()
-        )
-        db.add(new_experience)
-
-    for education in result.educations:
-        new_education = Education(
-            resume_id=new_resume.resume_id, **education.model_dump()
-        )
-        db.add(new_education)
-
-    for project in result.projects:
-        new_project = Project(resume_id=new_resume.resume_id, **project.model_dump())
-        db.add(new_project)
-
-    for activity in result.activities:
-        new_activity = Activity(resume_id=new_resume.resume_id, **activity.model_dump())
-        db.add(new_activity)
-
-    for qualification in result.qualifications:
-        new_qualification = Qualification(
-            resume_id=new_resume.resume_id, **qualification.model_dump()
-        )
-        db.add(new_qualification)
-
-    image_file = await db.execute(
-        select(File).where(
-            and_(File.fileable_id == parent_resume_id, File.purpose == "resume_image")
-        )
-    )
-    image_file = image_file.scalar_one_or_none()
-
-    if image_file is None:
+    if not any(image_file.purpose == "resume_image" for image_file in image_files):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="파일을 찾을 수 없습니다."
         )
 
-    new_image = await copy_image(
-        key=image_file.file_key, real_format=image_file.filetype
-    )
-
-    new_file = File(
-        fileable_id=new_resume.resume_id,
-        user_id=user_id,
-        filetype=image_file.filetype,
-        fileable_table="resumes",
-        org_file_name=image_file.org_file_name,
-        mod_file_name=new_image.get("unique_filename"),
-        file_key=new_image.get("new_image_key"),
-        purpose="resume_image",
-    )
-
-    db.add(new_file)
+    # 원본과 파생본 모두 복사하지 않고 참조만 공유
+    for image_file in image_files:
+        await share_image(
+            db=db,
+            image_file=image_file,
+            fileable_id=resume_id,
+            user_id=user_id,
+            fileable_table="resumes",
+        )
 
     await db.commit()
+    await invalidate_dashboard(user_id)
+    record_activity(user_id, ACTION_RESUME_CREATE)
 
-    resume_info = await get_resume_response(db=db, resume_id=new_resume.resume_id)
-
-    image_key = resume_info.get("image_key") if resume_info else None
-    image_url = await generate_presigned_url(image_key) if image_key else None
+    resume_info = await get_resume_response(db=db, resume_id=resume_id)
 
-    resume_info["image_url"] = image_url
+    await attach_image_urls(resume_info)
 
     resume_response = ResumeResponse.model_validate(resume_info).model_dump()
 
@@ -1,38 +1,200 @@
-from sqlalchemy import and_, select
+from typing import List, Optional, Tuple
+from sqlalchemy import JSON, and_, delete, func, insert, literal_column, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased, joinedload, contains_eager
-from app.models.models import Code, Education, Resume, File
+from sqlalchemy.orm import aliased, selectinload
+from app.models.models import (
+    Activity,
+    Education,
+    Experience,
+    File,
+    Project,
+    Qualification,
+    Resume,
+    TechnologyStack,
+)
+from app.service.code_service import get_code_detail
+
+
+# ResumeCreate/ResumeUpdate 의 컬렉션 필드 -> 자식 테이블 모델
+RESUME_CHILD_MODELS = {
+    "technology_stacks": TechnologyStack,
+    "experiences": Experience,
+    "educations": Education,
+    "projects": Project,
+    "activities": Activity,
+    "qualifications": Qualification,
+}
+
+RESUME_FIELDS = [
+    "title",
+    "name",
+    "email",
+    "gender",
+    "address",
+    "phone",
+    "military_service",
+    "birth_date",
+    "self_introduction",
+]
+
+
+async def insert_resume(db: AsyncSession, data, user_id: int, **overrides) -> int:
+    """이력서와 하위 컬렉션을 저장하는 함수 - INSERT ... RETURNING 후 컬렉션마다 multi-row INSERT 한 번"""
+
+    values = {field: getattr(data, field) for field in RESUME_FIELDS}
+    values.update(user_id=user_id, resume_type=data.resume_type)
+    values.update(overrides)
+
+    result = await db.execute(insert(Resume).values(**values).returning(Resume.resume_id))
+    resume_id = result.scalar_one()
+
+    await insert_resume_children(db=db, resume_id=resume_id, data=data)
+
+    return resume_id
+
+
+async def insert_resume_children(db: AsyncSession, resume_id: int, data) -> dict:
+    """하위 컬렉션을 컬렉션당 INSERT 한 번으로 저장하고 생성된 id 목록을 반환하는 함수"""
+
+    inserted_ids = {}
+
+    for field, model in RESUME_CHILD_MODELS.items():
+        items = getattr(data, field) or []
+
+        if not items:
+            inserted_ids[field] = []
+            continue
+
+        primary_key = model.__mapper__.primary_key[0]
+        result = await db.execute(
+            insert(model)
+            .values(
+                [
+                    {
+                        "resume_id": resume_id,
+                        **item.model_dump(exclude={primary_key.key}),
+                        "sort_order": index,
+                    }
+                    for index, item in enumerate(items)
+                ]
+            )
+            .returning(primary_key)
+        )
+        inserted_ids[field] = result.scalars().all()
+
+    return inserted_ids
+
+
+def diff_collection(
+    existing: dict, items: List[dict], primary_key: str
+) -> Tuple[List[dict], List[dict], List[int]]:
+    """기존 행 {id: 값}과 요청 항목을 비교해 (추가, 수정, 삭제) 목록을 계산하는 함수
+
+    id가 있는 항목은 같은 id의 행과 비교하고, id가 없는 항목은 값이 같은 남은 행이 있으면 그대로 유지한다.
+    이 이력서에 속하지 않는 id는 새 항목으로 취급한다.
+    """
+
+    unclaimed = dict(existing)
+    pending, inserts, updates = [], [], []
+
+    for values in items:
+        row_id = values.pop(primary_key, None)
+
+        if row_id in unclaimed:
+            if unclaimed.pop(row_id) != values:
+                updates.append({primary_key: row_id, **values})
+        else:
+            pending.append(values)
+
+    for values in pending:
+        row_id = next((i for i, current in unclaimed.items() if current == values), None)
+
+        if row_id is None:
+            inserts.append(values)
+        else:
+            del unclaimed[row_id]
+
+    return inserts, updates, list(unclaimed)
+
+
+async def update_resume_children(db: AsyncSession, resume_id: int, data) -> bool:
+    """하위 컬렉션을 기존 행과 비교해 바뀐 행만 INSERT/UPDATE/DELETE 하는 함수 - 변경 여부 반환"""
+
+    changed = False
+
+    for field, model in RESUME_CHILD_MODELS.items():
+        primary_key = model.__mapper__.primary_key[0]
+        columns = [
+            c for c in model.__table__.columns if c.key not in (primary_key.key, "resume_id")
+        ]
+
+        result = await db.execute(
+            select(primary_key, *columns).where(model.resume_id == resume_id)
+        )
+        existing = {}
+        for row in result:
+            values = row._asdict()
+            existing[values.pop(primary_key.key)] = values
+
+        # 순서만 바뀐 항목도 sort_order 가 달라져 UPDATE 대상이 된다
+        items = [
+            {**item.model_dump(), "sort_order": index}
+            for index, item in enumerate(getattr(data, field) or [])
+        ]
+        inserts, updates, deletes = diff_collection(existing, items, primary_key.key)
+
+        if deletes:
+            await db.execute(
+                delete(model).where(
+                    and_(model.resume_id == resume_id, primary_key.in_(deletes))
+                )
+            )
+
+        if updates:
+            # ORM bulk UPDATE by primary key - 행마다 같은 UPDATE 문을 executemany 로 실행
+            await db.execute(update(model), updates)
+
+        if inserts:
+            await db.execute(
+                insert(model).values([{"resume_id": resume_id, **values} for values in inserts])
+            )
+
+        changed = changed or bool(inserts or updates or deletes)
+
+    return changed
+
+
+def _image_key(purpose: str):
+    """이력서 이미지 파생본(purpose)의 file_key 를 읽는 스칼라 서브쿼리"""
+
+    return (
+        select(File.file_key)
+        .where(
+            and_(
+                File.fileable_id == Resume.resume_id,
+                File.fileable_table == "resumes",
+                File.purpose == purpose,
+            )
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
 
 
 async def get_resume_response(db: AsyncSession, resume_id: int):
     """이력서 상세 조회용 함수 - ResumeResponse 형태의 딕셔너리 반환"""
 
-    ResumetypeCode = aliased(Code)
-    GenderCode = aliased(Code)
-    MilitaryServiceCode = aliased(Code)
     ImageFile = aliased(File)
 
+    # 1:N 컬렉션을 한 번에 JOIN 하면 행 수가 컬렉션 크기의 곱만큼 늘어나므로
+    # 부모 행은 한 번만 읽고 각 컬렉션은 selectinload(resume_id IN ...)로 따로 읽는다
     stmt = (
         select(
             Resume,
-            GenderCode.code_detail.label("gender_detail"),
-            ResumetypeCode.code_detail.label("resume_type_detail"),
-            MilitaryServiceCode.code_detail.label("military_service_detail"),
             ImageFile.file_key.label("image_key"),
-        )
-        .outerjoin(
-            GenderCode,
-            (GenderCode.division == "gender") & (GenderCode.detail_id == Resume.gender),
-        )
-        .outerjoin(
-            ResumetypeCode,
-            (ResumetypeCode.division == "resume_type")
-            & (ResumetypeCode.detail_id == Resume.resume_type),
-        )
-        .outerjoin(
-            MilitaryServiceCode,
-            (MilitaryServiceCode.division == "military")
-            & (MilitaryServiceCode.detail_id == Resume.military_service),
+            _image_key("resume_image_webp").label("webp_image_key"),
+            _image_key("resume_thumbnail").label("thumbnail_key"),
         )
         .outerjoin(
             ImageFile,
@@ -40,49 +202,30 @@ async def get_resume_response(db: AsyncSession, resume_id: int):
             & (ImageFile.fileable_table == "resumes")
             & (ImageFile.purpose == "resume_image"),
         )
-        .outerjoin(Resume.experiences)
-        .outerjoin(Resume.educations)
-        .outerjoin(Resume.projects)
-        .outerjoin(Resume.activities)
-        .outerjoin(Resume.technology_stacks)
-        .outerjoin(Resume.qualifications)
         .options(
-            contains_eager(Resume.experiences),
-            contains_eager(Resume.educations),
-            contains_eager(Resume.projects),
-            contains_eager(Resume.activities),
-            contains_eager(Resume.technology_stacks),
-            contains_eager(Resume.qualifications),
+            selectinload(Resume.experiences),
+            selectinload(Resume.educations),
+            selectinload(Resume.projects),
+            selectinload(Resume.activities),
+            selectinload(Resume.technology_stacks),
+            selectinload(Resume.qualifications),
         )
         .where(and_(Resume.resume_id == resume_id, Resume.is_active == True))
+        .execution_options(populate_existing=True)
     )
-    
 
     result = await db.execute(stmt)
-    row = result.unique().first()
+    row = result.first()
 
     if row is None:
         return None
 
     # 튜플에서 각 요소 추출
-    resume, gender_detail, resume_type_detail, military_service_detail, image_key = row
-
-    # educations의 degree_level 값들 추출
-    degree_levels = [edu.degree_level for edu in resume.educations if edu.degree_level]
-
-    # degree_level에 해당하는 Code 데이터 조회
-    degree_code_map = {}
-    if degree_levels:
-        degree_codes_stmt = select(Code).where(
-            and_(Code.division == "degree", Code.detail_id.in_(degree_levels))
-        )
-        degree_codes_result = await db.execute(degree_codes_stmt)
-        degree_codes = degree_codes_result.scalars().all()
-        degree_code_map = {code.detail_id: code.code_detail for code in degree_codes}
+    resume, image_key, webp_image_key, thumbnail_key = row
 
     # educations에 degree_level_detail 추가
     for education in resume.educations:
-        education.degree_level_detail = degree_code_map.get(education.degree_level)
+        education.degree_level_detail = get_code_detail("degree", education.degree_level)
 
     # ResumeResponse 형태의 딕셔너리로 변환
     resume_dict = {
@@ -92,11 +235,11 @@ async def get_resume_response(db: AsyncSession, resume_id: int):
         "name": resume.name,
         "email": resume.email,
         "gender": resume.gender,
-        "gender_detail": gender_detail,
+        "gender_detail": get_code_detail("gender", resume.gender),
         "address": resume.address,
         "phone": resume.phone,
         "military_service": resume.military_service,
-        "military_service_detail": military_service_detail,
+        "military_service_detail": get_code_detail("military", resume.military_service),
         "birth_date": resume.birth_date,
         "self_introduction": resume.self_introduction,
         "experiences": resume.experiences,
@@ -106,10 +249,146 @@ async def get_resume_response(db: AsyncSession, resume_id: int):
         "technology_stacks": resume.technology_stacks,
         "qualifications": resume.qualifications,
         "resume_type": resume.resume_type,
-        "resume_type_detail": resume_type_detail,
+        "resume_type_detail": get_code_detail("resume_type", resume.resume_type),
         "created_at": resume.created_at,
         "updated_at": resume.updated_at,
         "image_key": image_key,  # presigned_url 생성에 필요
+        "webp_image_key": webp_image_key,
+        "thumbnail_key": thumbnail_key,
     }
 
     return resume_dict
+
+
+def _collection_json(model, order_column, *columns):
+    """자식 테이블 행들을 sort_order 순서의 JSON 배열로 집계하는 스칼라 서브쿼리"""
+
+    row_json = func.json_build_object(
+        *[
+            item
+            for column in columns
+            for item in (literal_column(f"'{column.key}'"), column)
+        ]
+    )
+
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(row_json, model.sort_order, order_column)),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        )
+        .where(model.resume_id == Resume.resume_id)
+        .scalar_subquery()
+    )
+
+
+async def get_resume_document(db: AsyncSession, resume_id: int) -> Optional[dict]:
+    """이력서 상세 조회 fast path - 자식 컬렉션까지 PostgreSQL에서 JSON으로 조립해 한 번의 왕복으로 조회
+
+    ORM 객체를 만들지 않고 ResumeResponse 형태의 dict(+ user_id, image_key)를 반환한다.
+    """
+
+    ImageFile = aliased(File)
+
+    stmt = (
+        select(
+            Resume.resume_id,
+            Resume.user_id,
+            Resume.title,
+            Resume.name,
+            Resume.email,
+            Resume.gender,
+            Resume.address,
+            Resume.phone,
+            Resume.military_service,
+            Resume.birth_date,
+            Resume.self_introduction,
+            ImageFile.file_key.label("image_key"),
+            _image_key("resume_image_webp").label("webp_image_key"),
+            _image_key("resume_thumbnail").label("thumbnail_key"),
+            _collection_json(
+                Experience,
+                Experience.experience_id,
+                Experience.experience_id,
+                Experience.job_title,
+                Experience.department,
+                Experience.position,
+                Experience.job_description,
+                Experience.employment_status,
+                Experience.start_date,
+                Experience.end_date,
+            ).label("experiences"),
+            _collection_json(
+                Education,
+                Education.education_id,
+                Education.education_id,
+                Education.organ,
+                Education.department,
+                Education.degree_level,
+                Education.score,
+                Education.start_date,
+                Education.end_date,
+            ).label("educations"),
+            _collection_json(
+                Project,
+                Project.project_id,
+                Project.project_id,
+                Project.title,
+                Project.start_date,
+                Project.end_date,
+                Project.description,
+            ).label("projects"),
+            _collection_json(
+                Activity,
+                Activity.activity_id,
+                Activity.activity_id,
+                Activity.title,
+                Activity.start_date,
+                Activity.end_date,
+                Activity.description,
+            ).label("activities"),
+            _collection_json(
+                TechnologyStack,
+                TechnologyStack.technology_stack_id,
+                TechnologyStack.technology_stack_id,
+                TechnologyStack.title,
+            ).label("technology_stacks"),
+            _collection_json(
+                Qualification,
+                Qualification.qualification_id,
+                Qualification.qualification_id,
+                Qualification.title,
+                Qualification.acquisition_date,
+                Qualification.score,
+                Qualification.organ,
+            ).label("qualifications"),
+        )
+        .outerjoin(
+            ImageFile,
+            (ImageFile.fileable_id == Resume.resume_id)
+            & (ImageFile.fileable_table == "resumes")
+            & (ImageFile.purpose == "resume_image"),
+        )
+        .where(and_(Resume.resume_id == resume_id, Resume.is_active == True))
+    )
+
+    result = await db.execute(stmt)
+    row = result.first()
+
+    if row is None:
+        return None
+
+    document = row._asdict()
+
+    document["gender_detail"] = get_code_detail("gender", document["gender"])
+    document["military_service_detail"] = get_code_detail(
+        "military", document["military_service"]
+    )
+    for education in document["educations"]:
+        education["degree_level_detail"] = get_code_detail(
+            "degree", education["degree_level"]
+        )
+
+    return document
@@ -0,0 +1,21 @@
+import unicodedata
+from typing import Optional
+
+
+def normalize_search_term(term: Optional[str]) -> Optional[str]:
+    """검색어 정규화 - 공백 제거, 한글 자모 분리 입력(NFD)을 완성형(NFC)으로 통일"""
+
+    if not term:
+        return None
+
+    term = unicodedata.normalize("NFC", term).strip()
+
+    return term or None
+
+
+def like_pattern(term: str) -> str:
+    """LIKE 와일드카드를 이스케이프한 부분 일치 패턴"""
+
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    return f"%{escaped}%"
@@ -0,0 +1,141 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.config.settings import settings
+from app.models.models import User
+from app.redis_client.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_PREFIX = "user_cache"
+
+# unique_id -> (만료 시각, 컬럼 값 dict), 프로세스 내 LRU
+_local_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+
+
+def _user_key(unique_id: str) -> str:
+    return f"{USER_CACHE_PREFIX}:{unique_id}"
+
+
+def _dump_user(user: User) -> dict:
+    """User 컬럼 값을 dict로 변환"""
+
+    return {c.key: getattr(user, c.key) for c in User.__table__.columns}
+
+
+def _encode(data: dict) -> str:
+    return json.dumps(
+        {k: v.isoformat() if isinstance(v, (date, datetime)) else v for k, v in data.items()}
+    )
+
+
+def _decode(raw: str) -> dict:
+    data = json.loads(raw)
+
+    for c in User.__table__.columns:
+        value = data.get(c.key)
+        if value is None:
+            continue
+        if c.type.python_type is datetime:
+            data[c.key] = datetime.fromisoformat(value)
+        elif c.type.python_type is date:
+            data[c.key] = date.fromisoformat(value)
+
+    return data
+
+
+def _local_get(unique_id: str) -> Optional[dict]:
+    item = _local_cache.get(unique_id)
+
+    if item is None:
+        return None
+
+    expires_at, data = item
+    if expires_at < time.monotonic():
+        _local_cache.pop(unique_id, None)
+        return None
+
+    _local_cache.move_to_end(unique_id)
+    return data
+
+
+def _local_set(unique_id: str, data: dict):
+    _local_cache[unique_id] = (time.monotonic() + settings.user_cache_local_ttl, data)
+    _local_cache.move_to_end(unique_id)
+
+    while len(_local_cache) > settings.user_cache_max_size:
+        _local_cache.popitem(last=False)
+
+
+async def get_cached_user(db: AsyncSession, unique_id: str) -> Optional[User]:
+    """unique_id로 사용자를 조회하는 함수 - 프로세스 LRU -> Redis -> DB 순서로 조회
+
+    캐시에서 복원한 객체는 SELECT 없이 세션에 연결되므로, 호출 측에서 수정 후 commit 하면 그대로 UPDATE 된다.
+    """
+
+    data = _local_get(unique_id)
+
+    if data is None:
+        try:
+            raw = await redis_client.get(_user_key(unique_id))
+            if raw:
+                data = _decode(raw)
+                _local_set(unique_id, data)
+
+        except Exception as e:
+            logger.warning(f"user cache get error: {e}")
+
+    if data is None:
+        result = await db.execute(select(User).where(User.unique_id == unique_id))
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            return None
+
+        await cache_user(user)
+
+        return user
+
+    user = User(**data)
+    make_transient_to_detached(user)
+
+    return await db.merge(user, load=False)
+
+
+async def cache_user(user: User, **values):
+    """DB 에서 읽은 사용자를 캐시에 저장하는 함수
+
+    values 로 아직 DB 에 기록되지 않은 값(쓰기 버퍼에 쌓인 last_accessed 등)을 덮어써 저장할 수 있다.
+    """
+
+    data = {**_dump_user(user), **values}
+    _local_set(user.unique_id, data)
+
+    try:
+        await redis_client.set(
+            _user_key(user.unique_id), _encode(data), ex=settings.user_cache_ttl
+        )
+
+    except Exception as e:
+        logger.warning(f"user cache set error: {e}")
+
+
+async def invalidate_user(unique_id: str):
+    """사용자 정보가 바뀌었을 때 캐시를 비우는 함수
+
+    다른 워커의 프로세스 LRU는 user_cache_local_ttl 이내에 만료된다.
+    """
+
+    _local_cache.pop(unique_id, None)
+
+    try:
+        await redis_client.delete(_user_key(unique_id))
+
+    except Exception as e:
+        logger.warning(f"user cache delete error: {e}")
@@ -0,0 +1,121 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import BinaryIO, Dict, Optional
+from PIL import Image, ImageOps
+from app.config.settings import settings
+
+# 이력서 사진 파생본의 files.purpose 값
+IMAGE_DERIVATIVE_PURPOSES = ("resume_image_webp", "resume_thumbnail")
+
+_image_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _encode_webp(image: Image.Image, quality: int, icc_profile: Optional[bytes]) -> bytes:
+    buffer = io.BytesIO()
+    # exif 를 넘기지 않으므로 위치 정보 등 EXIF 메타데이터는 저장되지 않는다
+    image.save(buffer, format="WEBP", quality=quality, icc_profile=icc_profile)
+
+    return buffer.getvalue()
+
+
+def render_derivatives(
+    path: str, max_size: int, thumbnail_size: int, quality: int, max_pixels: int
+) -> Dict[str, bytes]:
+    """(프로세스 풀에서 실행) EXIF 를 제거한 WebP 본문과 정사각형 썸네일을 만드는 함수
+
+    원본은 파일 경로로 받아 필요한 만큼만 디코딩한다.
+    """
+
+    with Image.open(path) as source:
+        width, height = source.size
+
+        if width * height > max_pixels:
+            raise ValueError(f"image too large: {width}x{height}")
+
+        icc_profile = source.info.get("icc_profile")
+
+        # JPEG 는 목표 크기에 가까운 축소 해상도로 바로 디코딩해 메모리를 줄인다
+        source.draft("RGB", (max_size, max_size))
+
+        # EXIF 회전 정보를 픽셀에 반영한 뒤 메타데이터 없이 다시 인코딩
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+        normalized = image.copy()
+        normalized.thumbnail((max_size, max_size))
+
+        thumbnail = ImageOps.fit(image, (thumbnail_size, thumbnail_size))
+
+    return {
+        "resume_image_webp": _encode_webp(normalized, quality, icc_profile),
+        "resume_thumbnail": _encode_webp(thumbnail, quality, icc_profile),
+    }
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    """이미지 인코딩용 프로세스 풀 - 처음 사용할 때 생성"""
+
+    global _image_pool
+
+    if _image_pool is None:
+        _image_pool = ProcessPoolExecutor(
+            max_workers=settings.image_process_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    return _image_pool
+
+
+def _spool_to_path(fileobj: BinaryIO) -> str:
+    """업로드 파일을 청크 단위로 임시 파일에 복사하고 경로를 반환"""
+
+    fileobj.seek(0)
+
+    with tempfile.NamedTemporaryFile(prefix="image-", delete=False) as target:
+        shutil.copyfileobj(fileobj, target, settings.image_chunk_size)
+
+    fileobj.seek(0)
+
+    return target.name
+
+
+async def create_image_derivatives(fileobj: BinaryIO) -> Dict[str, bytes]:
+    """업로드된 이미지로 파생본을 만드는 함수 - CPU 작업은 프로세스 풀에서 실행
+
+    원본 바이트를 프로세스 풀로 넘기지 않고 임시 파일 경로만 넘긴다.
+    """
+
+    path = await asyncio.to_thread(_spool_to_path, fileobj)
+    loop = asyncio.get_running_loop()
+
+    try:
+        return await loop.run_in_executor(
+            get_image_pool(),
+            partial(
+                render_derivatives,
+                path,
+                max_size=settings.image_normalized_max_size,
+                thumbnail_size=settings.image_thumbnail_size,
+                quality=settings.image_webp_quality,
+                max_pixels=settings.image_max_pixels,
+            ),
+        )
+
+    finally:
+        await asyncio.to_thread(os.unlink, path)
+
+
+def close_image_pool():
+    """앱 종료 시 프로세스 풀 정리"""
+
+    global _image_pool
+
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=True)
+        _image_pool = None
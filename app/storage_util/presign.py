@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import quote, urlsplit
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _quote(value: str, safe: str = "-_.~") -> str:
+    return quote(value, safe=safe)
+
+
+class SigV4Presigner:
+    """S3 GET presigned url을 네트워크 호출 없이 로컬에서 서명하는 클래스 (SigV4 query string 방식)
+
+    endpoint_url 이 있으면 path-style(endpoint/bucket/key), 없으면 virtual-hosted style 로 만든다.
+    """
+
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        bucket: str,
+        region: str,
+        endpoint_url: Optional[str] = None,
+    ):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region or "us-east-1"
+
+        if endpoint_url:
+            parts = urlsplit(endpoint_url)
+            self.scheme = parts.scheme or "https"
+            self.host = parts.netloc
+            self.path_prefix = f"{parts.path.rstrip('/')}/{bucket}"
+        else:
+            self.scheme = "https"
+            self.host = f"{bucket}.s3.{self.region}.amazonaws.com"
+            self.path_prefix = ""
+
+        # 서명 키는 날짜 단위로만 바뀌므로 재사용
+        self._signing_key_date: Optional[str] = None
+        self._signing_key: Optional[bytes] = None
+
+    def _get_signing_key(self, datestamp: str) -> bytes:
+        if self._signing_key_date != datestamp:
+            key = _hmac(f"AWS4{self.secret_key}".encode("utf-8"), datestamp)
+            key = _hmac(key, self.region)
+            key = _hmac(key, "s3")
+            self._signing_key = _hmac(key, "aws4_request")
+            self._signing_key_date = datestamp
+
+        return self._signing_key
+
+    def presign_get(self, key: str, expiration: int, now: Optional[datetime] = None) -> str:
+        """key 객체에 대한 GET presigned url 생성"""
+
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        datestamp = amz_date[:8]
+        scope = f"{datestamp}/{self.region}/s3/aws4_request"
+
+        canonical_uri = _quote(f"{self.path_prefix}/{key}", safe="/-_.~")
+        params = {
+            "X-Amz-Algorithm": ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expiration),
+            "X-Amz-SignedHeaders": "host",
+        }
+        canonical_query = "&".join(
+            f"{_quote(k)}={_quote(v)}" for k, v in sorted(params.items())
+        )
+
+        canonical_request = "\n".join(
+            [
+                "GET",
+                canonical_uri,
+                canonical_query,
+                f"host:{self.host}\n",
+                "host",
+                "UNSIGNED-PAYLOAD",
+            ]
+        )
+        string_to_sign = "\n".join(
+            [
+                ALGORITHM,
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            ]
+        )
+        signature = hmac.new(
+            self._get_signing_key(datestamp), string_to_sign.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+        return (
+            f"{self.scheme}://{self.host}{canonical_uri}"
+            f"?{canonical_query}&X-Amz-Signature={signature}"
+        )
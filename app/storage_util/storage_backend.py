@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import shutil
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Optional
+from urllib.parse import quote
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from app.config.settings import settings
+from app.storage_util.presign import SigV4Presigner
+
+logger = logging.getLogger(__name__)
+
+
+class StorageBackend(ABC):
+    """이미지 등 파일 저장소 인터페이스 - 모든 메서드는 이벤트 루프를 막지 않는다"""
+
+    @abstractmethod
+    async def upload_fileobj(self, fileobj: BinaryIO, key: str, content_type: str):
+        """파일 객체를 key 위치에 업로드"""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """key 위치의 파일 삭제"""
+
+    @abstractmethod
+    async def copy(self, source_key: str, target_key: str):
+        """source_key 파일을 target_key 로 복사"""
+
+    @abstractmethod
+    async def presigned_url(self, key: str, expiration: int) -> str:
+        """key 파일을 내려받을 수 있는 임시 url 생성"""
+
+    async def close(self):
+        """앱 종료 시 리소스 정리"""
+
+
+class S3StorageBackend(StorageBackend):
+    """boto3 S3 클라이언트를 전용 스레드 풀에서 실행하는 백엔드
+
+    boto3 클라이언트는 스레드 안전하므로 하나를 공유하고, 동시 요청 수는 스레드 풀 크기로 제한한다.
+    """
+
+    def __init__(self):
+        self.bucket = settings.aws_bucket_name
+        self.client = boto3.client(
+            "s3",
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+            endpoint_url=settings.aws_endpoint_url or None,
+            region_name=settings.aws_region,
+            config=Config(
+                max_pool_connections=settings.storage_max_workers,
+                connect_timeout=settings.storage_connect_timeout,
+                read_timeout=settings.storage_read_timeout,
+                retries={"mode": "standard", "max_attempts": settings.storage_max_attempts},
+            ),
+        )
+        self.presigner = SigV4Presigner(
+            access_key=settings.aws_access_key_id,
+            secret_key=settings.aws_secret_access_key,
+            bucket=self.bucket,
+            region=settings.aws_region,
+            endpoint_url=settings.aws_endpoint_url or None,
+        )
+        # 파일 객체에서 청크 단위로 읽어 올리므로 업로드 메모리는 파트 크기로 제한된다
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.storage_multipart_chunk_size,
+            multipart_chunksize=settings.storage_multipart_chunk_size,
+            max_concurrency=1,
+            use_threads=False,
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.storage_max_workers, thread_name_prefix="storage"
+        )
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def upload_fileobj(self, fileobj: BinaryIO, key: str, content_type: str):
+        await self._run(
+            self.client.upload_fileobj,
+            fileobj,
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=self.transfer_config,
+        )
+
+    async def delete(self, key: str):
+        await self._run(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def copy(self, source_key: str, target_key: str):
+        await self._run(
+            self.client.copy_object,
+            Bucket=self.bucket,
+            CopySource={"Bucket": self.bucket, "Key": source_key},
+            Key=target_key,
+        )
+
+    async def presigned_url(self, key: str, expiration: int) -> str:
+        # boto3 를 거치지 않고 로컬에서 SigV4 서명
+        return self.presigner.presign_get(key, expiration)
+
+    async def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class LocalStorageBackend(StorageBackend):
+    """로컬 디렉터리에 저장하는 백엔드 - S3 없이 개발/테스트할 때 사용"""
+
+    def __init__(self, root: Optional[str] = None, base_url: Optional[str] = None):
+        self.root = Path(root or settings.local_storage_dir).resolve()
+        self.base_url = (base_url or settings.local_storage_url).rstrip("/")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+
+        if self.root not in path.parents:
+            raise ValueError(f"잘못된 key 입니다: {key}")
+
+        return path
+
+    def _write(self, fileobj: BinaryIO, key: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+
+    def _copy(self, source_key: str, target_key: str):
+        target = self._path(target_key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self._path(source_key), target)
+
+    async def upload_fileobj(self, fileobj: BinaryIO, key: str, content_type: str):
+        await asyncio.to_thread(self._write, fileobj, key)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    async def copy(self, source_key: str, target_key: str):
+        await asyncio.to_thread(self._copy, source_key, target_key)
+
+    async def presigned_url(self, key: str, expiration: int) -> str:
+        return f"{self.base_url}/{quote(key)}"
+
+
+def create_storage_backend() -> StorageBackend:
+    """settings.storage_backend 값에 맞는 백엔드 생성"""
+
+    if settings.storage_backend == "local":
+        logger.info(f"로컬 스토리지를 사용합니다: {settings.local_storage_dir}")
+        return LocalStorageBackend()
+
+    return S3StorageBackend()
+
+
+storage: StorageBackend = create_storage_backend()
+
+
+async def close_storage():
+    """앱 종료 시 스토리지 백엔드 정리"""
+
+    await storage.close()
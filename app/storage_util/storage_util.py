@@ -1,49 +1,98 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import Dict, Iterable, Optional
 from uuid import uuid4
 from PIL import Image
-import io
 from fastapi import HTTPException, UploadFile, status
 from app.config.settings import settings
-import boto3
+from app.storage_util.storage_backend import storage
 
 
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=settings.aws_access_key_id,
-    aws_secret_access_key=settings.aws_secret_access_key,
-    endpoint_url=settings.aws_endpoint_url,
-    region_name=settings.aws_region,
-)
+# file_key -> (재사용 만료 시각, url), 프로세스 내 LRU
+_presigned_url_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+
+# 파일 앞부분 매직 바이트로 판별하는 지원 이미지 형식
+IMAGE_SIGNATURES = {
+    "jpeg": lambda header: header.startswith(b"\xff\xd8\xff"),
+    "png": lambda header: header.startswith(b"\x89PNG\r\n\x1a\n"),
+    "webp": lambda header: header[:4] == b"RIFF" and header[8:12] == b"WEBP",
+}
+IMAGE_HEADER_SIZE = 12
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """헤더 바이트로 이미지 형식을 판별하는 함수"""
+
+    for real_format, matches in IMAGE_SIGNATURES.items():
+        if matches(header):
+            return real_format
+
+    return None
+
+
+def _verify_image(fileobj, real_format: str):
+    fileobj.seek(0)
+    image = Image.open(fileobj)
+    image.verify()
+
+    if image.format.lower() != real_format:
+        raise ValueError(f"format mismatch: {image.format}")
 
 
 async def validate_image_file(file: UploadFile) -> dict:
-    """이미지 파일의 실제 확장자를 검증(리턴)하는 함수"""
+    """이미지 파일의 실제 확장자를 검증(리턴)하는 함수
 
-    contents = await file.read()
+    전체를 메모리에 올리지 않고 청크 단위로 읽으며 크기 제한과 sha256 을 계산한다.
+    업로드는 반환된 fileobj(UploadFile 의 SpooledTemporaryFile)에서 바로 스트리밍한다.
+    """
 
-    if len(contents) > settings.image_max_size:
+    if file.size is not None and file.size > settings.image_max_size:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="파일이 너무 큽니다."
         )
 
-    try:
-        image = Image.open(io.BytesIO(contents))
-        image.verify()
+    header = await file.read(IMAGE_HEADER_SIZE)
+    real_format = sniff_image_format(header)
+
+    if real_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="지원하지 않는 이미지 형식입니다.",
+        )
 
-        real_format = image.format.lower()
-        if real_format not in ["jpeg", "png", "webp"]:
+    digest = hashlib.sha256(header)
+    size = len(header)
+
+    while chunk := await file.read(settings.image_chunk_size):
+        size += len(chunk)
+
+        if size > settings.image_max_size:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="지원하지 않는 이미지 형식입니다.",
+                status_code=status.HTTP_400_BAD_REQUEST, detail="파일이 너무 큽니다."
             )
 
+        digest.update(chunk)
+
+    try:
+        await asyncio.to_thread(_verify_image, file.file, real_format)
+
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="유효하지 않은 이미지 파일"
         )
 
     await file.seek(0)
-    return {"real_format": real_format, "contents": contents, "filename": file.filename}
+    return {
+        "real_format": real_format,
+        "fileobj": file.file,
+        "content_hash": digest.hexdigest(),
+        "size": size,
+        "filename": file.filename,
+    }
 
 
 def generate_unique_filename(real_format: str) -> str:
@@ -52,19 +101,17 @@ def generate_unique_filename(real_format: str) -> str:
     return f"{uuid4()}.{real_format.lower()}"
 
 
-async def upload_to_image(file: dict) -> dict:
+async def upload_to_image(file: dict, unique_filename: Optional[str] = None) -> dict:
     """스토리지의 이미지 폴더에 저장하는 함수"""
     
     real_format = file.get('real_format')
-    unique_filename = generate_unique_filename(real_format)
+    unique_filename = unique_filename or generate_unique_filename(real_format)
     temp_key = f"{settings.image}/{unique_filename}"
 
-    s3_client.upload_fileobj(
-        io.BytesIO(file["contents"]),
-        settings.aws_bucket_name,
-        temp_key,
-        ExtraArgs={"ContentType": f"image/{real_format}"},
-    )
+    fileobj = file["fileobj"]
+    fileobj.seek(0)
+
+    await storage.upload_fileobj(fileobj, temp_key, content_type=f"image/{real_format}")
 
     return {"unique_filename": unique_filename, "temp_key": temp_key}
 
@@ -74,34 +121,35 @@ async def upload_to_image(file: dict) -> dict:
 async def delete_from_storage(key: str):
     """스토리지에서 파일을 삭제하는 함수"""
 
-    s3_client.delete_object(Bucket=settings.aws_bucket_name, Key=key)
+    _presigned_url_cache.pop(key, None)
+    await storage.delete(key)
 
 
 async def generate_presigned_url(
     key: str, expiration: int = settings.url_expire_minute
 ) -> str:
-    """임시 url을 생성하는 함수"""
+    """임시 url을 생성하는 함수 - 유효 시간의 presigned_url_reuse_ratio 동안은 같은 url을 재사용"""
+
+    now = time.monotonic()
+    cached = _presigned_url_cache.get(key)
 
-    url = s3_client.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": settings.aws_bucket_name, "Key": key},
-        ExpiresIn=expiration,
-    )
+    if cached is not None and cached[0] > now:
+        _presigned_url_cache.move_to_end(key)
+        return cached[1]
+
+    url = await storage.presigned_url(key, expiration)
+
+    if expiration == settings.url_expire_minute:
+        _presigned_url_cache[key] = (now + expiration * settings.presigned_url_reuse_ratio, url)
+        _presigned_url_cache.move_to_end(key)
+
+        while len(_presigned_url_cache) > settings.presigned_url_cache_max_size:
+            _presigned_url_cache.popitem(last=False)
 
     return url
 
 
+async def generate_presigned_urls(keys: Iterable[str]) -> Dict[str, str]:
+    """여러 file_key 의 임시 url을 한 번에 생성하는 함수 - 목록 화면용"""
 
-async def copy_image(key: str, real_format:str)->dict:
-    '''스토리지에 이미지를 복사하는 엔드포인트'''
-    
-    unique_filename = generate_unique_filename(real_format=real_format)
-    new_image_key = f"{settings.image}/{unique_filename}"
-    
-    s3_client.copy_object(
-        Bucket = settings.aws_bucket_name,
-        CopySource = {'Bucket': settings.aws_bucket_name, "Key": key},
-        Key = new_image_key
-    )
-    
-    return {"new_image_key":new_image_key, "unique_filename": unique_filename}
\ No newline at end of file
+    return {key: await generate_presigned_url(key) for key in dict.fromkeys(keys) if key}
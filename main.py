@@ -1,18 +1,43 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from app.config.settings import settings
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from app.routers import auth
 from app.routers import job_postings
 from app.routers import auth, job_postings, resumes, users, resume_feedback, dashboard
+from app.http_client.http_client import close_http_client, init_http_client
+from app.redis_client.redis_client import close_redis
+from app.service.activity_service import run_activity_flusher, stop_activity_flusher
+from app.service.code_service import reload_codes
+from app.service.pagination_service import NEXT_CURSOR_HEADER
+from app.storage_util.image_processing import close_image_pool
+from app.storage_util.storage_backend import close_storage
 
 
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await reload_codes()
+    await init_http_client()
+    activity_flusher = asyncio.create_task(run_activity_flusher())
+    yield
+    await stop_activity_flusher(activity_flusher)
+    await close_http_client()
+    close_image_pool()
+    await close_storage()
+    await close_redis()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.app_name,
     description=settings.description if settings.debug else None,
     debug=settings.debug,
@@ -26,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 @app.exception_handler(ValidationError)
@@ -44,6 +70,14 @@ app.include_router(users.router)
 app.include_router(resume_feedback.router)
 app.include_router(dashboard.router)
 
+if settings.storage_backend == "local":
+    # 로컬 스토리지 사용 시 presigned url 대신 정적 파일로 제공
+    app.mount(
+        settings.local_storage_url,
+        StaticFiles(directory=settings.local_storage_dir, check_dir=False),
+        name="storage",
+    )
+
 
 # @app.get("/healthy")
 # def health_check():
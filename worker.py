@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from app.config.settings import settings
+from app.database import AsyncSessionLocal
+from app.service.activity_service import run_activity_flusher, stop_activity_flusher
+from app.service.code_service import reload_codes
+from app.service.feedback_job_service import (
+    ack_feedback_job,
+    claim_feedback_job,
+    get_feedback_job,
+    run_feedback_job,
+    run_job_reaper,
+    set_feedback_job_status,
+)
+
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+logger = logging.getLogger(__name__)
+
+
+async def process_next_job(worker_id: int):
+    """큐에서 피드백 작업을 하나 꺼내 처리하는 함수 - 대기 중인 작업이 없으면 바로 반환"""
+
+    # 소켓 타임아웃보다 짧게 대기 후 다시 시도
+    job_id = await claim_feedback_job(timeout=1)
+
+    if job_id is None:
+        return
+
+    job = await get_feedback_job(job_id)
+
+    if job is None:
+        await ack_feedback_job(job_id)
+        return
+
+    await set_feedback_job_status(job_id, "running", claimed_at=time.time())
+
+    async with AsyncSessionLocal() as db:
+        try:
+            feedback = await run_feedback_job(job, db)
+            await set_feedback_job_status(
+                job_id, "done", feedback_id=feedback.feedback_id
+            )
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[worker {worker_id}] job {job_id} error: {e}")
+            await set_feedback_job_status(
+                job_id, "failed", error="피드백 생성에 실패했습니다."
+            )
+
+    # 성공/실패가 기록된 뒤에만 ack - 그 전에 죽으면 reaper 가 큐로 되돌린다
+    await ack_feedback_job(job_id)
+
+
+async def consume(worker_id: int):
+    """큐에서 피드백 작업을 하나씩 꺼내 처리하는 루프
+
+    Redis 오류는 이 루프 안에서 기록 후 점점 길게 쉬었다가 다시 시도하므로 다른 consumer 는 멈추지 않는다.
+    처리 도중 실패해 ack 하지 못한 작업은 reaper 가 큐로 되돌린다.
+    """
+
+    backoff = settings.feedback_worker_backoff
+
+    while True:
+        try:
+            await process_next_job(worker_id)
+            backoff = settings.feedback_worker_backoff
+
+        except Exception as e:
+            logger.error(f"[worker {worker_id}] queue error: {e}, retry in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.feedback_worker_max_backoff)
+
+
+async def main():
+    await reload_codes()
+    activity_flusher = asyncio.create_task(run_activity_flusher())
+    job_reaper = asyncio.create_task(run_job_reaper())
+
+    try:
+        await asyncio.gather(
+            *(consume(i) for i in range(settings.feedback_worker_concurrency))
+        )
+    finally:
+        job_reaper.cancel()
+        await stop_activity_flusher(activity_flusher)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())